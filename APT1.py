@@ -1,12 +1,18 @@
 #!/usr/bin/env python3
 import pygame
-import time
-import subprocess
 import random
 from collections import deque
 import os
 from game_manager import game_manager
+from scene_manager import scene_manager
+from sim_clock import sim_clock
 from font_helper import get_chinese_font, get_default_font
+from asset_cache import get_animation, load_image, load_scaled
+from text_cache import render_text
+from dirty_rect import DirtyRenderer, draw_rect
+from viewport import SpatialGrid, Viewport, centered_bounds
+from tiled_map import TiledMap
+from hud import HudLabel, ResourceHUD
 
 # Initialize Pygame
 pygame.init()
@@ -36,7 +42,8 @@ BUILDING_CENTERS = [
 
 class Map:
     def __init__(self):
-        self.background = pygame.image.load("./assets/apt/a1map.png")
+        # Drawn tile by tile; only tiles near the screen are kept in memory
+        self.background = TiledMap("./assets/apt/a1map.png")
         self.bg_rect = self.background.get_rect()
         self.bg_rect.center = (WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2)
         self.drag_start = None
@@ -98,11 +105,11 @@ class Map:
         self.animating = True
         self.anim_start_pos = (self.bg_rect.x, self.bg_rect.y)
         self.anim_target_pos = (desired_x, desired_y)
-        self.anim_start_time = time.time()
+        self.anim_start_time = sim_clock.now()
         
     def update(self):
         if self.animating:
-            current_time = time.time()
+            current_time = sim_clock.now()
             elapsed = current_time - self.anim_start_time
             progress = min(elapsed / self.anim_duration, 1.0)
             
@@ -123,7 +130,7 @@ class Map:
             return 1 - pow(-2 * t + 2, 3) / 2
         
     def draw(self, screen):
-        screen.blit(self.background, self.bg_rect)
+        self.background.draw(screen, self.bg_rect.topleft)
         
     def world_to_screen(self, world_pos):
         return (world_pos[0] + self.bg_rect.x, world_pos[1] + self.bg_rect.y)
@@ -140,25 +147,13 @@ class Building:
         self.animation_cycle = 0
         self.showing_final = False
         
-        # Load construction images
-        self.construction_imgs = []
-        for i in range(1, 6):
-            img = pygame.image.load(f"./assets/mainmap/construction{i}.png")
-            img = pygame.transform.scale(img, (200, 200))
-            self.construction_imgs.append(img)
-            
-        self.construction_static = pygame.image.load("./assets/mainmap/construction.png")
-        self.construction_static = pygame.transform.scale(self.construction_static, (200, 200))
-        
-        # Load fireworks
-        self.fireworks = []
-        for i in range(1, 7):
-            img = pygame.image.load(f"./assets/fireworks/fireworks{i}.png")
-            img = pygame.transform.scale(img, (400, 500))
-            self.fireworks.append(img)
+        # Effect animations are shared by every building
+        self.construction_imgs = get_animation("construction")
+        self.construction_static = get_animation("construction_static")[0]
+        self.fireworks = get_animation("fireworks")
             
         # Load final building image
-        self.final_img = pygame.image.load(f"./assets/apt/a{index+1}.png")
+        self.final_img = load_image(f"./assets/apt/a{index+1}.png")
         
     def upgrade(self):
         if self.level < 5:
@@ -167,7 +162,7 @@ class Building:
             
     def start_animation(self):
         self.animating = True
-        self.animation_start = time.time()
+        self.animation_start = sim_clock.now()
         self.animation_frame = 0
         self.animation_cycle = 0
         if self.level < 5:
@@ -179,7 +174,7 @@ class Building:
         if not self.animating:
             return
             
-        current_time = time.time()
+        current_time = sim_clock.now()
         
         if self.animation_type == "construction":
             # Construction animation: 3 cycles of 5 frames, 0.2s each
@@ -235,23 +230,22 @@ class UpgradeButton:
         self.rect = pygame.Rect(self.pos, self.size)
         
         # Load icon
-        self.icon = pygame.image.load(f"./assets/apt/a{index+1}_icon.png")
-        self.icon = pygame.transform.scale(self.icon, (64, 64))
+        self.icon = load_scaled(f"./assets/apt/a{index+1}_icon.png", (64, 64))
         
         # Progress bar
         self.progress_rect = pygame.Rect(self.pos[0], self.pos[1] - 24, 90, 18)
         
     def draw(self, screen, level):
         # Draw button background
-        pygame.draw.rect(screen, BEIGE, self.rect)
-        pygame.draw.rect(screen, GOLD, self.rect, 2)
+        draw_rect(screen, BEIGE, self.rect)
+        draw_rect(screen, GOLD, self.rect, 2)
         
         # Draw icon
         icon_rect = self.icon.get_rect(center=self.rect.center)
         screen.blit(self.icon, icon_rect)
         
         # Draw progress bar
-        pygame.draw.rect(screen, GOLD, self.progress_rect, 2)
+        draw_rect(screen, GOLD, self.progress_rect, 2)
         
         # Draw progress cells
         cell_width = 18
@@ -261,26 +255,31 @@ class UpgradeButton:
                                    cell_width,
                                    self.progress_rect.height)
             if i < level:
-                pygame.draw.rect(screen, GREEN, cell_rect)
+                draw_rect(screen, GREEN, cell_rect)
             else:
-                pygame.draw.rect(screen, RED, cell_rect)
-            pygame.draw.rect(screen, GOLD, cell_rect, 1)
+                draw_rect(screen, RED, cell_rect)
+            draw_rect(screen, GOLD, cell_rect, 1)
             
     def handle_click(self, pos):
         return self.rect.collidepoint(pos)
 
 class Game:
     def __init__(self):
-        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-        pygame.display.set_caption("APT1")
-        self.clock = pygame.time.Clock()
+        self.screen = scene_manager.get_display((WINDOW_WIDTH, WINDOW_HEIGHT), "APT1")
+        # Only the parts of the screen that changed are redrawn
+        self.renderer = DirtyRenderer()
+        # update() runs once per simulation step, not once per frame
+        self.fixed_timestep = True
         self.running = True
         self.font = get_chinese_font(20)
         self.level_font = get_chinese_font(30)
         self.ui_font = get_chinese_font(30)
+        self.level_label = HudLabel(self.level_font, "Level = {}", RED)
+        # MP/Coins panel, re-rendered only when a number changes
+        self.resource_hud = ResourceHUD(self.ui_font, (WINDOW_WIDTH - 210, 10), coins_color=GOLD)
         
-        # Load game data
-        game_manager.load_game_data()
+        # Pick up changes other scenes made to the save
+        game_manager.refresh()
         
         # Level system - load from save (completion count, not building level)
         self.A1 = game_manager.get_building_data('apt1').get('completion_count', 0)
@@ -304,14 +303,21 @@ class Game:
                 building.showing_final = True
             self.buildings.append(building)
             
+        # Off-screen objects are skipped; a building covers the area of its biggest image
+        self.viewport = Viewport(self.map, (WINDOW_WIDTH, WINDOW_HEIGHT))
+        self.building_grid = SpatialGrid()
+        for building in self.buildings:
+            self.building_grid.insert(building, centered_bounds(building.center, (
+                *building.construction_imgs, building.construction_static,
+                *building.fireworks, building.final_img)))
+            
         # Create upgrade buttons
         self.upgrade_buttons = []
         for i in range(5):
             self.upgrade_buttons.append(UpgradeButton(i))
             
         # Back button
-        self.back_button = pygame.image.load("./assets/back.png")
-        self.back_button = pygame.transform.scale(self.back_button, (30, 30))
+        self.back_button = load_scaled("./assets/back.png", (30, 30))
         self.back_rect = self.back_button.get_rect(topleft=(550, 50))
         
         
@@ -346,16 +352,16 @@ class Game:
                         self.showing_congratulations = False
                         self.A1 += 1
                         # Update in save file (save to completion_count, not building_level)
-                        game_manager.game_data['buildings']['apt1']['completion_count'] = self.A1
+                        game_manager.set_completion_count('apt1', self.A1)
                         game_manager._update_island_level()
-                        game_manager.save_game_data()
                         self.reset_building_levels()
+                        game_manager.save_game_data()
+                        game_manager.flush()
                     return
                 
                 # Check back button
                 if self.back_rect.collidepoint(event.pos):
-                    subprocess.Popen(["python3", "main_game.py"])
-                    self.running = False
+                    scene_manager.back()
                     return
                         
                 # Check upgrade buttons
@@ -379,94 +385,83 @@ class Game:
         # Update passive income every minute
         game_manager.update_passive_income()
         
+        # Write coalesced save changes at most every save_interval seconds
+        game_manager.flush_if_due()
+        
         self.map.update()
         
         # Update buildings
         for building in self.buildings:
             building.update()
         
+    def is_idle(self):
+        """Nothing on screen moves: no camera or building animation"""
+        return (not self.map.animating and not self.map.dragging
+                and not any(building.animating for building in self.buildings))
+        
     def draw(self):
-        self.screen.fill(WHITE)
+        screen = self.renderer.begin(self.screen)
+        screen.fill(WHITE)
         
         # Draw map
-        self.map.draw(self.screen)
+        self.map.draw(screen)
         
         # Draw buildings - first pass: draw final buildings and static construction
-        for building in self.buildings:
+        visible_buildings = self.building_grid.query(self.viewport.world_rect())
+        for building in visible_buildings:
             if building.showing_final or building.level == 5 or self.A1 > 0 or (building.level > 0 and building.level < 5 and not building.animating):
-                building.draw(self.screen, self.map, self.A1)
+                building.draw(screen, self.map, self.A1)
         
             
         # Draw buildings - second pass: draw animations on top
-        for building in self.buildings:
+        for building in visible_buildings:
             if building.animating:
-                building.draw(self.screen, self.map, self.A1)
+                building.draw(screen, self.map, self.A1)
             
         # Draw UI
         # Draw level indicator in top-left
-        level_text = self.level_font.render(f"Level = {self.A1}", True, RED)
-        self.screen.blit(level_text, (10, 10))
+        self.level_label.draw(screen, (10, 10), self.A1)
         
         # Draw MP and Coins display
-        self._draw_resources()
+        self._draw_resources(screen)
         
         # Back button
-        self.screen.blit(self.back_button, self.back_rect)
+        screen.blit(self.back_button, self.back_rect)
         
         # Upgrade buttons
         for i, btn in enumerate(self.upgrade_buttons):
-            btn.draw(self.screen, self.buildings[i].level)
+            btn.draw(screen, self.buildings[i].level)
             
         # Draw congratulations popup if needed
         if self.showing_congratulations:
             # Draw popup background
-            pygame.draw.rect(self.screen, WHITE, self.congrats_rect)
-            pygame.draw.rect(self.screen, BLACK, self.congrats_rect, 3)
+            draw_rect(screen, WHITE, self.congrats_rect)
+            draw_rect(screen, BLACK, self.congrats_rect, 3)
             
             # Draw congratulations text
-            congrats_text = self.font.render("Congratulations,", True, BLACK)
+            congrats_text = render_text(self.font, "Congratulations,", BLACK)
             text_rect = congrats_text.get_rect(center=(self.congrats_rect.centerx, self.congrats_rect.y + 50))
-            self.screen.blit(congrats_text, text_rect)
+            screen.blit(congrats_text, text_rect)
             
-            upgrade_text = self.font.render("You've Upgraded!", True, BLACK)
+            upgrade_text = render_text(self.font, "You've Upgraded!", BLACK)
             text_rect = upgrade_text.get_rect(center=(self.congrats_rect.centerx, self.congrats_rect.y + 80))
-            self.screen.blit(upgrade_text, text_rect)
+            screen.blit(upgrade_text, text_rect)
             
             # Draw OK button
-            pygame.draw.rect(self.screen, GOLD, self.ok_button_rect)
-            pygame.draw.rect(self.screen, BLACK, self.ok_button_rect, 2)
-            ok_text = self.font.render("OK", True, BLACK)
+            draw_rect(screen, GOLD, self.ok_button_rect)
+            draw_rect(screen, BLACK, self.ok_button_rect, 2)
+            ok_text = render_text(self.font, "OK", BLACK)
             ok_rect = ok_text.get_rect(center=self.ok_button_rect.center)
-            self.screen.blit(ok_text, ok_rect)
+            screen.blit(ok_text, ok_rect)
             
-        pygame.display.flip()
+        self.renderer.present()
         
-    def _draw_resources(self):
+    def _draw_resources(self, screen):
         """Draw MP and Coins at top of screen"""
-        mp, coins = game_manager.get_player_resources()
-        
-        # Draw background for resources
-        resource_bg = pygame.Surface((200, 60))
-        resource_bg.fill((200, 200, 200))
-        resource_bg.set_alpha(200)
-        self.screen.blit(resource_bg, (WINDOW_WIDTH - 210, 10))
-        
-        # Draw MP
-        mp_text = self.ui_font.render(f"MP: {int(mp)}", True, (0, 0, 255))
-        self.screen.blit(mp_text, (WINDOW_WIDTH - 200, 15))
-        
-        # Draw Coins
-        coins_text = self.ui_font.render(f"Coins: {int(coins)}", True, GOLD)
-        self.screen.blit(coins_text, (WINDOW_WIDTH - 200, 40))
+        self.resource_hud.draw(screen)
         
     def run(self):
-        while self.running:
-            self.handle_events()
-            self.update()
-            self.draw()
-            self.clock.tick(FPS)
-            
-        pygame.quit()
+        scene_manager.run(self)
 
 if __name__ == "__main__":
     game = Game()
@@ -1,26 +1,44 @@
 #!/usr/bin/env python3
 import pygame
-import sys
+from scene_manager import scene_manager
+from font_helper import get_default_font
 
 pygame.init()
-screen = pygame.display.set_mode((600, 800))
-pygame.display.set_caption("Ask")
-clock = pygame.time.Clock()
 
-running = True
-while running:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
-    
-    screen.fill((180, 180, 100))
-    font = pygame.font.Font(None, 36)
-    text = font.render("Ask - Under Construction", True, (255, 255, 255))
-    text_rect = text.get_rect(center=(300, 400))
-    screen.blit(text, text_rect)
-    
-    pygame.display.flip()
-    clock.tick(60)
+WINDOW_WIDTH = 600
+WINDOW_HEIGHT = 800
+FPS = 60
 
-pygame.quit()
-sys.exit()
\ No newline at end of file
+class Game:
+    def __init__(self):
+        self.screen = scene_manager.get_display((WINDOW_WIDTH, WINDOW_HEIGHT), "Ask")
+        self.running = True
+        font = get_default_font(36)
+        self.text = font.render("Ask - Under Construction", True, (255, 255, 255))
+        self.text_rect = self.text.get_rect(center=(300, 400))
+        
+    def handle_events(self):
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                self.running = False
+            elif event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                scene_manager.back()
+                
+    def update(self):
+        pass
+        
+    def is_idle(self):
+        """Nothing on this screen moves"""
+        return True
+        
+    def draw(self):
+        self.screen.fill((180, 180, 100))
+        self.screen.blit(self.text, self.text_rect)
+        pygame.display.flip()
+        
+    def run(self):
+        scene_manager.run(self)
+
+if __name__ == "__main__":
+    game = Game()
+    game.run()
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+import json
+import os
+import pygame
+
+# Process-wide image caches. Every scene object asking for the same image at
+# the same size gets the same Surface back, so nothing is decoded twice.
+_image_cache = {}
+_scaled_cache = {}
+_factor_cache = {}
+_character_frames = {}
+_character_sets = {}
+_animations = {}
+_baked = None  # (source, size) -> (baked file, source mtime), (source, factor) -> size; see bake_assets.py
+
+BAKED_DIR = "./assets/baked"
+MANIFEST_PATH = os.path.join(BAKED_DIR, "manifest.json")
+MANIFEST_VERSION = 2
+
+CHARACTER_TYPES = range(1, 10)
+DIRECTIONS = range(1, 5)
+FRAMES_PER_DIRECTION = 4
+
+# Effect animations shared by every building: name -> (frame paths, size)
+ANIMATIONS = {
+    "construction": ([f"./assets/mainmap/construction{i}.png" for i in range(1, 6)], (200, 200)),
+    "construction_static": (["./assets/mainmap/construction.png"], (200, 200)),
+    "fireworks": ([f"./assets/fireworks/fireworks{i}.png" for i in range(1, 7)], (400, 500)),
+}
+
+def uses_alpha(image):
+    """True if any pixel is not fully opaque"""
+    if not image.get_flags() & pygame.SRCALPHA:
+        return False
+    opaque = pygame.mask.from_surface(image, 254).count()
+    return opaque < image.get_width() * image.get_height()
+
+def to_display_format(image):
+    """
+    The image in the display's pixel format, so blitting it needs no per-pixel
+    conversion: convert_alpha() if it is (partly) transparent, convert()
+    otherwise. Colorkeys survive convert(). Without a display the image is
+    returned as is and converted later by convert_loaded().
+    """
+    if pygame.display.get_surface() is None:
+        return image
+    if uses_alpha(image):
+        return image.convert_alpha()
+    return image.convert()
+
+def load_image(path):
+    """Load an image from disk once per process and return the shared Surface"""
+    image = _image_cache.get(path)
+    if image is None:
+        image = to_display_format(pygame.image.load(path))
+        _image_cache[path] = image
+    return image
+
+def _load_original(path):
+    # Full-size originals are only kept if someone asked for them unscaled
+    image = _image_cache.get(path)
+    if image is None:
+        image = to_display_format(pygame.image.load(path))
+    return image
+
+def baked_path(source, size):
+    """Where bake_assets.py puts a scaled image, e.g. assets/back.png -> assets/baked/back@30x30.png"""
+    name = os.path.splitext(os.path.relpath(source, "assets"))[0]
+    return os.path.normpath(os.path.join(BAKED_DIR, f"{name}@{size[0]}x{size[1]}.png"))
+
+def read_manifest():
+    """The baked image entries, or [] if nothing was baked (or by another version)"""
+    try:
+        with open(MANIFEST_PATH, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return []
+    if manifest.get("version") != MANIFEST_VERSION:
+        return []
+    return manifest.get("images", [])
+
+def write_manifest(entries):
+    os.makedirs(BAKED_DIR, exist_ok=True)
+    temp_path = MANIFEST_PATH + ".tmp"
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump({"version": MANIFEST_VERSION, "images": entries}, f, indent=1)
+    os.replace(temp_path, MANIFEST_PATH)
+
+def _baked_index():
+    global _baked
+    if _baked is None:
+        _baked = {}
+        for entry in read_manifest():
+            size = tuple(entry["size"])
+            _baked[(entry["source"], size)] = (entry["file"], entry["source_mtime"])
+            if entry.get("factor") is not None:
+                _baked[(entry["source"], entry["factor"])] = size
+    return _baked
+
+def _load_baked(path, size):
+    """
+    The pre-scaled image from the manifest, unless missing or its source was
+    changed after baking
+    """
+    source = os.path.normpath(path)
+    entry = _baked_index().get((source, size))
+    if entry is None:
+        return None
+    file, source_mtime = entry
+    try:
+        if os.path.exists(source) and os.path.getmtime(source) > source_mtime:
+            return None
+        return to_display_format(pygame.image.load(file))
+    except (OSError, pygame.error):
+        return None
+
+def load_scaled(path, size):
+    """Load an image scaled to an exact (width, height), baked if possible"""
+    key = (path, tuple(size))
+    image = _scaled_cache.get(key)
+    if image is None:
+        image = _load_baked(path, key[1])
+        if image is None:
+            image = pygame.transform.scale(_load_original(path), key[1])
+        _scaled_cache[key] = image
+    return image
+
+def load_scaled_by(path, factor):
+    """Load an image scaled by a factor of its original size"""
+    key = (path, factor)
+    image = _factor_cache.get(key)
+    if image is None:
+        size = _baked_index().get((os.path.normpath(path), factor))
+        if size is not None:
+            # Baked: the original never needs to be decoded
+            image = load_scaled(path, size)
+            _factor_cache[key] = image
+            return image
+        original = _load_original(path)
+        size = (int(original.get_width() * factor),
+                int(original.get_height() * factor))
+        image = _scaled_cache.get((path, size))
+        if image is None:
+            image = pygame.transform.scale(original, size)
+            _scaled_cache[(path, size)] = image
+        _factor_cache[key] = image
+    return image
+
+def get_character_frame(char_type, direction, frame, scale=0.5):
+    """Get a single pre-scaled walk frame (frame is 0-based)"""
+    key = (char_type, direction, frame, scale)
+    image = _character_frames.get(key)
+    if image is None:
+        img_path = f"./assets/characters/c{char_type}_{direction}-{frame + 1}.png"
+        image = load_scaled_by(img_path, scale)
+        _character_frames[key] = image
+    return image
+
+def get_character_sprites(char_type, scale=0.5):
+    """
+    Get the walk frames for a character type as {direction: (frame, ...)}.
+    The returned mapping is shared by every character of that type and scale,
+    so callers must treat it as read-only.
+    """
+    key = (char_type, scale)
+    sprites = _character_sets.get(key)
+    if sprites is None:
+        sprites = {}
+        for direction in DIRECTIONS:
+            sprites[direction] = tuple(get_character_frame(char_type, direction, frame, scale)
+                                       for frame in range(FRAMES_PER_DIRECTION))
+        _character_sets[key] = sprites
+    return sprites
+
+def get_animation(name):
+    """
+    Get the frames of a named effect animation as a tuple of Surfaces. Every
+    building references the same tuple instead of building its own list.
+    """
+    frames = _animations.get(name)
+    if frames is None:
+        paths, size = ANIMATIONS[name]
+        frames = tuple(load_scaled(path, size) for path in paths)
+        _animations[name] = frames
+    return frames
+
+def preload_characters(scale=0.5):
+    """Load every character type at the given scale so spawning never touches disk"""
+    for char_type in CHARACTER_TYPES:
+        get_character_sprites(char_type, scale)
+
+def _display_formats():
+    """(bitsize, masks) of convert() and convert_alpha() results, or None without a display"""
+    display = pygame.display.get_surface()
+    if display is None:
+        return None
+    alpha = pygame.Surface((1, 1), pygame.SRCALPHA).convert_alpha()
+    return ((display.get_bitsize(), display.get_masks()),
+            (alpha.get_bitsize(), alpha.get_masks()))
+
+def _is_display_format(image, formats):
+    opaque, alpha = formats
+    wanted = alpha if image.get_flags() & pygame.SRCALPHA else opaque
+    return (image.get_bitsize(), image.get_masks()) == wanted
+
+def _caches():
+    yield from _image_cache.items()
+    yield from _scaled_cache.items()
+    yield from _factor_cache.items()
+    yield from _character_frames.items()
+
+def convert_loaded():
+    """
+    Convert images cached before the display existed. Scene objects that
+    already hold such an image keep the old Surface; unconverted_surfaces()
+    lists them. Returns the number of images converted.
+    """
+    formats = _display_formats()
+    if formats is None:
+        return 0
+    converted = {}
+    for cache in (_image_cache, _scaled_cache, _factor_cache, _character_frames):
+        for key, image in cache.items():
+            if not _is_display_format(image, formats):
+                if id(image) not in converted:
+                    converted[id(image)] = to_display_format(image)
+                cache[key] = converted[id(image)]
+    for sprites in _character_sets.values():
+        for direction, frames in sprites.items():
+            sprites[direction] = tuple(converted.get(id(frame), frame) for frame in frames)
+    for name, frames in _animations.items():
+        _animations[name] = tuple(converted.get(id(frame), frame) for frame in frames)
+    return len(converted)
+
+def unconverted_surfaces(surfaces=()):
+    """
+    Cache keys (and the given extra surfaces) whose pixel format differs from
+    the display's, i.e. images that pay a format conversion on every blit
+    """
+    formats = _display_formats()
+    if formats is None:
+        return []
+    found = [key for key, image in _caches() if not _is_display_format(image, formats)]
+    found.extend(image for image in surfaces if not _is_display_format(image, formats))
+    return found
+
+def report_unconverted(surfaces=()):
+    """Print the images that are blitted without being in the display format"""
+    found = unconverted_surfaces(surfaces)
+    for item in found:
+        print(f"Unconverted surface: {item}")
+    return found
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+# Bakes the scaled images the scenes ask for into ./assets/baked, plus a
+# manifest asset_cache reads, so no scene resamples a full-size image at
+# runtime. The build scripts run it before packaging; run it by hand after
+# changing images or scale factors:
+#
+#     python bake_assets.py [--force]
+#
+# Scale factors are read from the scenes' source: every load_scaled(),
+# load_scaled_by(), get_character_sprites() and preload_characters() call
+# whose arguments are literals, module constants, loop variables over a
+# constant dict or list, or constructor parameters passed literals. Values
+# are taken per loop iteration and per call site, never combined across
+# them. Anything else is listed as skipped and keeps being scaled at runtime.
+#
+# The manifest records each original's modification time, so the game uses
+# a baked image until its original is edited.
+#
+# The map backgrounds are also cut into tiles for tiled_map.TiledMap.
+import ast
+import glob
+import itertools
+import os
+import sys
+import pygame
+import asset_cache
+import tiled_map
+
+SCENE_SCRIPTS = "./*.py"
+FACTOR_CALLS = {"load_scaled_by"}
+SIZE_CALLS = {"load_scaled"}
+CHARACTER_CALLS = {"get_character_sprites": 1, "preload_characters": 0}  # name -> scale argument
+
+class Unresolved(Exception):
+    pass
+
+class SceneScanner:
+    """Finds the (path, size) and (path, factor) variants one scene script loads"""
+
+    def __init__(self, script):
+        self.script = script
+        with open(script, 'r', encoding='utf-8') as f:
+            self.tree = ast.parse(f.read(), script)
+        self.constants = {}
+        for node in self.tree.body:
+            if isinstance(node, ast.Assign) and len(node.targets) == 1 \
+                    and isinstance(node.targets[0], ast.Name):
+                try:
+                    self.constants[node.targets[0].id] = ast.literal_eval(node.value)
+                except ValueError:
+                    pass
+        self.parents = {}
+        for node in ast.walk(self.tree):
+            for child in ast.iter_child_nodes(node):
+                self.parents[child] = node
+
+    def _enclosing(self, node, kind):
+        while node in self.parents:
+            node = self.parents[node]
+            if isinstance(node, kind):
+                yield node
+
+    def values(self, node):
+        """Every value an argument expression can take"""
+        return [values[0] for values in self.value_sets([node])]
+
+    def value_sets(self, nodes):
+        """
+        Every combination of values the argument expressions take together.
+        Names bound by one loop or one function's parameters are resolved per
+        iteration or per call site, so values passed together stay together.
+        """
+        for node in nodes:
+            binding = self._binding(node)
+            if binding is not None:
+                break
+        else:
+            return list(itertools.product(*(self._leaf_values(node) for node in nodes)))
+        names = {node.id for node in nodes if self._binding(node) == binding}
+        sets = []
+        for bound in self._bound_values(binding, names):
+            sets.extend(self.value_sets([bound[node.id] if self._binding(node) == binding else node
+                                         for node in nodes]))
+        return sets
+
+    def _binding(self, node):
+        """The loop or function whose variable or parameter a name is, or None"""
+        if not isinstance(node, ast.Name):
+            return None
+        for loop in self._enclosing(node, ast.For):
+            targets = loop.target.elts if isinstance(loop.target, ast.Tuple) else [loop.target]
+            if any(isinstance(target, ast.Name) and target.id == node.id for target in targets):
+                return loop
+        for function in self._enclosing(node, ast.FunctionDef):
+            if node.id in [arg.arg for arg in function.args.args]:
+                return function
+        return None
+
+    def _bound_values(self, binding, names):
+        """{name: expression} for the given names, once per loop iteration or call site"""
+        if isinstance(binding, ast.For):
+            return self._loop_values(binding, names)
+        return self._parameter_values(binding, names)
+
+    def _leaf_values(self, node):
+        if isinstance(node, ast.JoinedStr):
+            # f"./assets/apt/a{index+1}_icon.png": whatever files match
+            pattern = "".join(part.value if isinstance(part, ast.Constant) else "*"
+                              for part in node.values)
+            matches = sorted(glob.glob(pattern))
+            if not matches:
+                raise Unresolved(f"no file matches {pattern}")
+            return matches
+        if isinstance(node, ast.Name):
+            if node.id in self.constants:
+                return [self.constants[node.id]]
+            raise Unresolved(node.id)
+        try:
+            return [ast.literal_eval(node)]
+        except ValueError:
+            raise Unresolved(ast.unparse(node))
+
+    def _loop_values(self, loop, names):
+        iterable = loop.iter
+        method = None
+        if isinstance(iterable, ast.Call) and isinstance(iterable.func, ast.Attribute):
+            method = iterable.func.attr
+            iterable = iterable.func.value
+        if not isinstance(iterable, ast.Name) or iterable.id not in self.constants:
+            raise Unresolved(ast.unparse(iterable))
+        items = self.constants[iterable.id]
+        if method == "items":
+            items = list(items.items())
+        elif method == "values":
+            items = list(items.values())
+        if isinstance(loop.target, ast.Tuple):
+            targets = [target.id if isinstance(target, ast.Name) else None for target in loop.target.elts]
+            return [{name: ast.Constant(item[position]) for position, name in enumerate(targets) if name in names}
+                    for item in items]
+        return [{loop.target.id: ast.Constant(item)} for item in items]
+
+    def _parameter_values(self, function, names):
+        # Parameters of a function or of a class's __init__, set by literal calls
+        callee = function.name
+        parameters = [arg.arg for arg in function.args.args]
+        if callee == "__init__":
+            classes = list(self._enclosing(function, ast.ClassDef))
+            if not classes:
+                raise Unresolved(function.name)
+            callee = classes[0].name
+            parameters = parameters[1:]  # self
+        calls = []
+        for call in ast.walk(self.tree):
+            if isinstance(call, ast.Call) and isinstance(call.func, ast.Name) and call.func.id == callee:
+                passed = dict(zip(parameters, call.args))
+                if names <= passed.keys():
+                    calls.append({name: passed[name] for name in names})
+        if not calls:
+            raise Unresolved(f"{callee} arguments {', '.join(sorted(names))}")
+        return calls
+
+    def variants(self, skipped):
+        """(path, ("size", (w, h)) or ("factor", f)) for every resolvable scaling call"""
+        found = set()
+        for call in ast.walk(self.tree):
+            if not isinstance(call, ast.Call) or not isinstance(call.func, ast.Name):
+                continue
+            name = call.func.id
+            try:
+                if name in SIZE_CALLS or name in FACTOR_CALLS:
+                    kind = "size" if name in SIZE_CALLS else "factor"
+                    for path, scale in self.value_sets(call.args[:2]):
+                        found.add((path, (kind, tuple(scale) if kind == "size" else scale)))
+                elif name in CHARACTER_CALLS:
+                    position = CHARACTER_CALLS[name]
+                    scales = self.values(call.args[position]) if len(call.args) > position else [0.5]
+                    for scale in scales:
+                        for char_type, direction, frame in itertools.product(
+                                asset_cache.CHARACTER_TYPES, asset_cache.DIRECTIONS,
+                                range(asset_cache.FRAMES_PER_DIRECTION)):
+                            path = f"./assets/characters/c{char_type}_{direction}-{frame + 1}.png"
+                            found.add((path, ("factor", scale)))
+            except Unresolved as e:
+                skipped.append(f"{self.script}:{call.lineno} {name}: {e}")
+        return found
+
+def animation_variants():
+    for paths, size in asset_cache.ANIMATIONS.values():
+        for path in paths:
+            yield path, ("size", tuple(size))
+
+def collect_variants(skipped):
+    variants = set(animation_variants())
+    for script in sorted(glob.glob(SCENE_SCRIPTS)):
+        if os.path.basename(script) in ("asset_cache.py", "bake_assets.py"):
+            continue
+        variants |= SceneScanner(script).variants(skipped)
+    return sorted(variants, key=lambda variant: (variant[0], repr(variant[1])))
+
+def bake_image(path, size, baked_path):
+    """Scale exactly as asset_cache would at runtime and save the result"""
+    image = pygame.image.load(path)
+    image = pygame.transform.scale(image, size)
+    if image.get_colorkey() is not None:
+        # Keep colorkey transparency as alpha, which PNG stores reliably
+        transparent = pygame.Surface(size, pygame.SRCALPHA, 32)
+        transparent.blit(image, (0, 0))
+        image = transparent
+    elif not asset_cache.uses_alpha(image):
+        # Fully opaque: drop the alpha channel for a smaller file
+        opaque = pygame.Surface(size, 0, 24)
+        opaque.blit(image, (0, 0))
+        image = opaque
+    os.makedirs(os.path.dirname(baked_path), exist_ok=True)
+    temp_path = baked_path + ".tmp.png"
+    pygame.image.save(image, temp_path)
+    os.replace(temp_path, baked_path)
+
+def bake_all(force=False):
+    """Bake every scaled variant the scenes use and write the manifest"""
+    skipped = []
+    entries = []
+    previous = {(entry["source"], entry["file"]): entry["source_mtime"] for entry in asset_cache.read_manifest()}
+    for path, (kind, scale) in collect_variants(skipped):
+        source = os.path.normpath(path)
+        if not os.path.exists(source):
+            skipped.append(f"{path}: missing")
+            continue
+        if kind == "size":
+            size = tuple(scale)
+        else:
+            width, height = pygame.image.load(source).get_size()
+            size = (int(width * scale), int(height * scale))
+        file = asset_cache.baked_path(source, size)
+        source_mtime = os.path.getmtime(source)
+        up_to_date = previous.get((source, file)) == source_mtime and os.path.exists(file)
+        if force or not up_to_date:
+            bake_image(source, size, file)
+            print(f"{source} -> {file}")
+        # The game compares this mtime to spot an original edited after baking
+        entries.append({"source": source, "source_mtime": source_mtime, "size": list(size),
+                        "factor": scale if kind == "factor" else None, "file": file})
+    asset_cache.write_manifest(entries)
+    print(f"{len(entries)} scaled images in {asset_cache.MANIFEST_PATH}")
+    for item in skipped:
+        print(f"Skipped (scaled at runtime): {item}")
+
+if __name__ == "__main__":
+    force = "--force" in sys.argv
+    bake_all(force)
+    tiled_map.cut_all(force)
@@ -22,6 +22,21 @@ if [ ! -f "main.py" ]; then
     cp main_game.py main.py 2>/dev/null || echo "⚠️  main.py already exists or couldn't create"
 fi
 
+# Transcode the video clips into frame stores (frame_store.py) so the
+# device plays them without OpenCV; baking needs opencv-python here
+echo "🎞️  Baking video frames..."
+if ! python3 frame_store.py; then
+    echo "❌ Baking video frames failed (pip3 install opencv-python)"
+    exit 1
+fi
+
+# Pre-scale images and cut map tiles into assets/baked (bake_assets.py)
+echo "🖼️  Baking scaled images and map tiles..."
+if ! python3 bake_assets.py; then
+    echo "❌ Baking images failed"
+    exit 1
+fi
+
 echo ""
 echo "📱 Starting Android build..."
 echo "This will take 30-60 minutes on first run as it downloads Android SDK/NDK"
@@ -57,6 +57,21 @@ if __name__ == "__main__":
 EOF
 fi
 
+# Transcode the video clips into frame stores (frame_store.py) so the
+# device plays them without OpenCV; baking needs opencv-python here
+echo "🎞️  Baking video frames..."
+if ! python3 frame_store.py; then
+    echo "❌ Baking video frames failed (pip3 install opencv-python)"
+    exit 1
+fi
+
+# Pre-scale images and cut map tiles into assets/baked (bake_assets.py)
+echo "🖼️  Baking scaled images and map tiles..."
+if ! python3 bake_assets.py; then
+    echo "❌ Baking images failed"
+    exit 1
+fi
+
 # Run buildozer with automatic yes to all prompts
 echo "y" | python3 -m buildozer android debug
 
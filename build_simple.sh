@@ -26,8 +26,8 @@ title = Puto Island
 package.name = putoisland
 package.domain = org.puto
 source.dir = .
-source.include_exts = py,png,jpg,json,txt,mp4
-source.include_patterns = assets/**,*.py,*.json,*.txt
+source.include_exts = py,png,jpg,json,txt,mp4,frames
+source.exclude_patterns = assets/mainmap/mainmap.png,assets/temple1/t1map.png,assets/temple2/t2map.png,assets/hotel/h1map.png,assets/apt/a1map.png,assets/restaurant/r1map.png
 version = 1.0.0
 requirements = python3,pygame==2.1.3
 orientation = portrait
@@ -38,6 +38,21 @@ log_level = 2
 warn_on_root = 1
 EOF
 
+# Transcode the video clips into frame stores (frame_store.py) so the
+# device plays them without OpenCV; baking needs opencv-python here
+echo "🎞️  Baking video frames..."
+if ! python3 frame_store.py; then
+    echo "❌ Baking video frames failed (pip3 install opencv-python)"
+    exit 1
+fi
+
+# Pre-scale images and cut map tiles into assets/baked (bake_assets.py)
+echo "🖼️  Baking scaled images and map tiles..."
+if ! python3 bake_assets.py; then
+    echo "❌ Baking images failed"
+    exit 1
+fi
+
 # Run minimal build
 echo "📱 Starting minimal Android build..."
 BUILDOZER_SPEC_PATH=buildozer_minimal.spec python3 -m buildozer android debug
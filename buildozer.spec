@@ -13,7 +13,7 @@ package.domain = org.test
 source.dir = .
 
 # (list) Source files to include (let empty to include all the files)
-source.include_exts = py,png,jpg,kv,atlas,json,txt,ttf,mp4
+source.include_exts = py,png,jpg,kv,atlas,json,txt,ttf,mp4,frames
 
 # (list) List of inclusions using pattern matching
 #source.include_patterns = assets/*,images/*.png
@@ -26,7 +26,8 @@ source.exclude_dirs = tests, bin, .buildozer
 
 # (list) List of exclusions using pattern matching
 # Do not prefix with './'
-#source.exclude_patterns = license,images/*/*.jpg
+# The full map backgrounds: the game draws the tiles bake_assets.py cuts from them
+source.exclude_patterns = assets/mainmap/mainmap.png,assets/temple1/t1map.png,assets/temple2/t2map.png,assets/hotel/h1map.png,assets/apt/a1map.png,assets/restaurant/r1map.png
 
 # (str) Application versioning (method 1)
 version = 0.1
@@ -3,7 +3,8 @@ title = Puto Island
 package.name = putoisland
 package.domain = org.example
 source.dir = .
-source.include_exts = py,png,jpg,txt,json
+source.include_exts = py,png,jpg,txt,json,frames
+source.exclude_patterns = assets/mainmap/mainmap.png,assets/temple1/t1map.png,assets/temple2/t2map.png,assets/hotel/h1map.png,assets/apt/a1map.png,assets/restaurant/r1map.png
 version = 0.1
 requirements = python3,pygame2
 orientation = portrait
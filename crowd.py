@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+class Crowd:
+    """
+    Struct-of-arrays store for a scene's walking characters. Positions,
+    speeds, current waypoints, facing and animation frames live in NumPy
+    arrays and everyone is moved and animated in one batched step().
+
+    step() returns the characters that need their own update() this frame:
+    those that reached a waypoint and those whose timer came due (see
+    update_agent). The character state machines stay in the scenes; the
+    crowd only replaces the per-character movement math and per-frame calls.
+    Only used when NumPy is installed (Crowd.available).
+    """
+
+    available = np is not None
+
+    def __init__(self, locations, frame_duration=0.25, arrive_distance=10, frames=4, capacity=64):
+        self.locations = locations
+        self.frame_duration = frame_duration
+        self.arrive_distance = arrive_distance
+        self.frames = frames
+        self.count = 0  # High-water mark of used slots
+        self.free_slots = []
+        self.agents = []
+        self.routes = []
+        self.path_index = []
+        self.arrivals = {}  # slot -> waypoint reached in the last step
+        self.added = 0  # Agents ever added, numbering them in drawing order
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        old = getattr(self, "pos", None)
+        arrays = {
+            "pos": np.zeros((capacity, 2)),
+            "previous_pos": np.zeros((capacity, 2)),  # Before the last step, for interpolation
+            "target": np.zeros((capacity, 2)),
+            "speed": np.zeros(capacity),
+            "last_frame_change": np.zeros(capacity),
+            "wake": np.full(capacity, np.inf),
+            "direction": np.full(capacity, 3, dtype=np.int8),  # 1=left, 2=right, 3=down, 4=up
+            "frame": np.zeros(capacity, dtype=np.int8),
+            "alive": np.zeros(capacity, dtype=bool),
+            "moving": np.zeros(capacity, dtype=bool),
+            "has_target": np.zeros(capacity, dtype=bool),
+            "order": np.zeros(capacity, dtype=np.int64),
+        }
+        for name, array in arrays.items():
+            if old is not None:
+                current = getattr(self, name)
+                array[:len(current)] = current
+            setattr(self, name, array)
+        self.capacity = capacity
+
+    def add(self, agent, pos, speed, now):
+        """Add a character standing at pos; returns its slot"""
+        if self.free_slots:
+            slot = self.free_slots.pop()
+            self.agents[slot] = agent
+            self.routes[slot] = ()
+            self.path_index[slot] = 0
+        else:
+            if self.count == self.capacity:
+                self._allocate(self.capacity * 2)
+            slot = self.count
+            self.count += 1
+            self.agents.append(agent)
+            self.routes.append(())
+            self.path_index.append(0)
+        self.pos[slot] = pos
+        self.previous_pos[slot] = pos
+        self.speed[slot] = speed
+        self.last_frame_change[slot] = now
+        self.wake[slot] = np.inf
+        self.direction[slot] = 3
+        self.frame[slot] = 0
+        self.alive[slot] = True
+        self.moving[slot] = True
+        self.has_target[slot] = False
+        self.order[slot] = self.added
+        self.added += 1
+        return slot
+
+    def remove(self, slot):
+        self.alive[slot] = False
+        self.agents[slot] = None
+        self.routes[slot] = ()
+        self.free_slots.append(slot)
+
+    def set_route(self, slot, route):
+        """Walk a (shared, read-only) route of location names from its start"""
+        self.routes[slot] = route
+        self.path_index[slot] = 0
+        self._target_next(slot)
+
+    def _target_next(self, slot):
+        route = self.routes[slot]
+        index = self.path_index[slot]
+        if index < len(route):
+            self.target[slot] = self.locations[route[index]]
+            self.has_target[slot] = True
+        else:
+            self.has_target[slot] = False
+
+    def update_agent(self, slot, moving, wake_time):
+        """
+        After a character's update(): whether its state walks, and the earliest
+        time its update() must run again even if it reaches no waypoint
+        """
+        self.moving[slot] = moving
+        self.wake[slot] = wake_time
+
+    def position(self, slot):
+        return (float(self.pos[slot, 0]), float(self.pos[slot, 1]))
+
+    def sprite_state(self, slot, alpha=1.0):
+        """
+        (position, direction, frame) for drawing; alpha below 1 places the
+        character that far between its previous and latest step
+        """
+        if alpha < 1.0:
+            x, y = self.previous_pos[slot] + (self.pos[slot] - self.previous_pos[slot]) * alpha
+            pos = (float(x), float(y))
+        else:
+            pos = self.position(slot)
+        return pos, int(self.direction[slot]), int(self.frame[slot])
+
+    def in_rect(self, rect):
+        """Agents positioned inside a world rect, in the order they were added"""
+        n = self.count
+        x = self.pos[:n, 0]
+        y = self.pos[:n, 1]
+        inside = self.alive[:n] & (x >= rect.left) & (x < rect.right) & (y >= rect.top) & (y < rect.bottom)
+        slots = np.flatnonzero(inside)
+        slots = slots[np.argsort(self.order[slots])]
+        return [self.agents[slot] for slot in slots]
+
+    def take_arrival(self, slot):
+        """Waypoint the character reached in the last step, if any"""
+        return self.arrivals.pop(slot, None)
+
+    def step(self, now):
+        """Advance animation and movement for everyone; return the agents that need an update()"""
+        n = self.count
+        alive = self.alive[:n]
+
+        # Animation frames
+        due = np.flatnonzero(alive & (now - self.last_frame_change[:n] > self.frame_duration))
+        if due.size:
+            self.frame[due] = (self.frame[due] + 1) % self.frames
+            self.last_frame_change[due] = now
+
+        # Movement towards the current waypoint
+        self.previous_pos[:n] = self.pos[:n]
+        self.arrivals = {}
+        walkers = np.flatnonzero(alive & self.moving[:n] & self.has_target[:n])
+        if walkers.size:
+            delta = self.target[walkers] - self.pos[walkers]
+            dist = np.hypot(delta[:, 0], delta[:, 1])
+            reached = dist < self.arrive_distance
+
+            stepping = ~reached
+            slots = walkers[stepping]
+            if slots.size:
+                dx = delta[stepping, 0]
+                dy = delta[stepping, 1]
+                scale = self.speed[slots] / dist[stepping]
+                self.pos[slots, 0] += dx * scale
+                self.pos[slots, 1] += dy * scale
+                horizontal = np.abs(dx) > np.abs(dy)
+                self.direction[slots] = np.where(horizontal,
+                                                 np.where(dx < 0, 1, 2),
+                                                 np.where(dy < 0, 4, 3))
+
+            # Arrivals are rare: snap to the waypoint and aim for the next one
+            for slot in walkers[reached].tolist():
+                self.pos[slot] = self.target[slot]
+                self.arrivals[slot] = self.routes[slot][self.path_index[slot]]
+                self.path_index[slot] += 1
+                self._target_next(slot)
+
+        # Timers (stay over, lifetime) that came due
+        woken = np.flatnonzero(alive & (self.wake[:n] < now))
+        self.wake[woken] = np.inf
+
+        slots = set(self.arrivals)
+        slots.update(woken.tolist())
+        return [self.agents[slot] for slot in sorted(slots)]
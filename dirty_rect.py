@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+import pygame
+
+ENABLED = True  # False: every frame is drawn in full and flipped, as before
+FULL_REDRAW_SHARE = 0.5  # Redraw everything once this share of the screen changed
+MAX_RECTS = 24  # More separate dirty regions than this are merged into one
+
+# Bumped whenever something other than the renderer may have drawn on the display
+_generation = 0
+
+def invalidate():
+    """The display no longer shows the last presented frame (scene switch, new window)"""
+    global _generation
+    _generation += 1
+
+def draw_rect(surface, color, rect, width=0):
+    """pygame.draw.rect, recorded instead when drawing on a DirtyRenderer"""
+    if isinstance(surface, DirtyRenderer):
+        return surface.draw_rect(color, rect, width)
+    return pygame.draw.rect(surface, color, rect, width)
+
+def _fill_rect(surface, color, rect, width):
+    """
+    The pixels of pygame.draw.rect(surface, color, rect, width) as fills.
+    pygame.draw.rect draws a 1px outline one row off when the surface is
+    clipped through it; fills clip exactly.
+    """
+    rect = pygame.Rect(rect)
+    if width <= 0 or 2 * width >= min(rect.width, rect.height):
+        surface.fill(color, rect)
+        return
+    surface.fill(color, (rect.x, rect.y, rect.width, width))
+    surface.fill(color, (rect.x, rect.bottom - width, rect.width, width))
+    surface.fill(color, (rect.x, rect.y, width, rect.height))
+    surface.fill(color, (rect.right - width, rect.y, width, rect.height))
+
+def _merge(rects):
+    """Union overlapping rects until none overlap"""
+    merged = []
+    for rect in rects:
+        rect = rect.copy()
+        while True:
+            index = rect.collidelist(merged)
+            if index < 0:
+                break
+            rect.union_ip(merged.pop(index))
+        merged.append(rect)
+    return merged
+
+class DirtyRenderer:
+    """
+    Draws a scene's frames by redrawing only what changed. Between begin()
+    and present() the renderer stands in for the screen: blit(), fill() and
+    draw_rect() are recorded rather than drawn. present() compares the
+    recording with the previous frame's; every operation that appeared,
+    disappeared or moved marks its old and new area dirty. Only operations
+    touching a dirty area are replayed, clipped to it, and only those areas
+    are pushed to the window. A camera pan moves the map background, which
+    covers the screen, so it falls back to a full redraw by itself.
+
+    Surfaces are compared by identity, so anything blitted must not be drawn
+    on after it was first shown (cached images and text are never changed).
+    """
+
+    def __init__(self):
+        self.display = None
+        self.ops = []
+        self.rects = []
+        self.previous_ops = []
+        self.previous_rects = []
+        self.generation = None
+        self.full_redraws = 0
+        self.partial_redraws = 0
+
+    def begin(self, display):
+        """Start a frame for the display surface; returns what to draw on"""
+        if not ENABLED:
+            return display
+        self.display = display
+        self.bounds = display.get_rect()
+        self.ops = []
+        self.rects = []
+        return self
+
+    # Drawing API recorded for present()
+    def get_rect(self, **kwargs):
+        return self.display.get_rect(**kwargs)
+
+    def get_size(self):
+        return self.display.get_size()
+
+    def get_width(self):
+        return self.display.get_width()
+
+    def get_height(self):
+        return self.display.get_height()
+
+    def _record(self, op, rect):
+        rect = rect.clip(self.bounds)
+        self.ops.append(op)
+        self.rects.append(rect)
+        return rect
+
+    def blit(self, source, dest, area=None, special_flags=0):
+        if isinstance(dest, pygame.Rect):
+            x, y = dest.topleft
+        else:
+            x, y = int(dest[0]), int(dest[1])
+        if area is not None:
+            area = pygame.Rect(area).clip(source.get_rect())
+            rect = pygame.Rect(x, y, area.width, area.height)
+            area = tuple(area)
+        else:
+            rect = pygame.Rect((x, y), source.get_size())
+        return self._record(("blit", source, (x, y), area, special_flags), rect)
+
+    def fill(self, color, rect=None, special_flags=0):
+        rect = self.bounds if rect is None else pygame.Rect(rect)
+        return self._record(("fill", tuple(pygame.Color(color)), tuple(rect), special_flags), rect)
+
+    def draw_rect(self, color, rect, width=0):
+        rect = pygame.Rect(rect)
+        return self._record(("rect", tuple(pygame.Color(color)), tuple(rect), width), rect)
+
+    def _replay(self, indices):
+        display = self.display
+        for index in indices:
+            op = self.ops[index]
+            kind = op[0]
+            if kind == "blit":
+                display.blit(op[1], op[2], op[3], op[4])
+            elif kind == "fill":
+                display.fill(op[1], op[2], op[3])
+            else:
+                _fill_rect(display, op[1], op[2], op[3])
+
+    def _dirty_rects(self):
+        """Areas that differ from the previous frame, or None for a full redraw"""
+        if self.generation != _generation or pygame.event.peek((pygame.VIDEOEXPOSE, pygame.WINDOWEXPOSED)):
+            return None
+        if self.ops == self.previous_ops:
+            return []
+        current = {}
+        for op, rect in zip(self.ops, self.rects):
+            current.setdefault(op, []).append(rect)
+        previous = {}
+        for op, rect in zip(self.previous_ops, self.previous_rects):
+            previous.setdefault(op, []).append(rect)
+        dirty = []
+        for op, rects in current.items():
+            unchanged = len(previous.get(op, ()))
+            dirty.extend(rects[unchanged:])
+        for op, rects in previous.items():
+            unchanged = len(current.get(op, ()))
+            dirty.extend(rects[unchanged:])
+        # What stayed must also stay in the same order, or overlaps could flip
+        kept = [op for op in self.ops if op in previous]
+        if kept != [op for op in self.previous_ops if op in current]:
+            return None
+        dirty = _merge([rect for rect in dirty if rect.width and rect.height])
+        if len(dirty) > MAX_RECTS:
+            dirty = [dirty[0].unionall(dirty[1:])]
+        area = sum(rect.width * rect.height for rect in dirty)
+        if area >= FULL_REDRAW_SHARE * self.bounds.width * self.bounds.height:
+            return None
+        return dirty
+
+    def present(self):
+        """Draw what changed since the last frame and show it"""
+        if not ENABLED:
+            pygame.display.flip()
+            return
+        dirty = self._dirty_rects()
+        if dirty is None:
+            self._replay(range(len(self.ops)))
+            pygame.display.flip()
+            self.full_redraws += 1
+        elif dirty:
+            for rect in dirty:
+                self.display.set_clip(rect)
+                self._replay(rect.collidelistall(self.rects))
+            self.display.set_clip(None)
+            pygame.display.update(dirty)
+            self.partial_redraws += 1
+        self.generation = _generation
+        self.previous_ops = self.ops
+        self.previous_rects = self.rects
@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+import math
+import time
+import pygame
+from text_layout import wrap_text
+
+TILE_HEIGHT = 512  # Documents are rasterized in strips of this many pixels
+WHEEL_STEP = 30  # Pixels one wheel notch travels in total
+FRICTION = 8.0  # Fling velocity decays by e^-FRICTION per second
+MIN_SPEED = 5  # Flings slower than this many pixels per second stop
+
+class DocumentView:
+    """
+    A scrolling text document in a window rect. The text is laid out once
+    and rasterized into tiles the first time they scroll into view, so
+    scrolling only changes which tiles are blitted and where. Wheel and
+    drag scrolling glide to a stop.
+    """
+
+    def __init__(self, text, font, rect, color=(255, 255, 255), background=(20, 20, 20),
+                 line_height=35, margin=(50, 50)):
+        self.font = font
+        self.rect = pygame.Rect(rect)
+        self.color = color
+        self.background = background
+        self.line_height = line_height
+        self.margin_x, self.margin_y = margin
+        # Lines wider than the window are wrapped instead of running off its edge
+        width = self.rect.width - 2 * self.margin_x
+        self.lines = []
+        for line in text.split('\n'):
+            if font.size(line)[0] <= width:
+                self.lines.append(line)
+            else:
+                self.lines.extend(wrap_text(line, font, width))
+        self.content_height = self.margin_y + len(self.lines) * line_height
+        self.max_scroll = max(0, self.content_height - self.rect.height)
+        self.tiles = {}  # tile index -> surface
+        self.offset = 0.0
+        self.velocity = 0.0  # pixels per second, positive scrolls down
+        self.drag_y = None
+        self.drag_time = 0
+        self.last_update = time.time()
+
+    def handle_event(self, event):
+        if event.type == pygame.MOUSEWHEEL:
+            # The same distance per notch as a direct step, spread over the glide
+            self.velocity -= event.y * WHEEL_STEP * FRICTION
+        elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+            if self.rect.collidepoint(event.pos):
+                self.drag_y = event.pos[1]
+                self.drag_time = time.time()
+                self.velocity = 0.0
+        elif event.type == pygame.MOUSEBUTTONUP and event.button == 1:
+            self.drag_y = None
+            if time.time() - self.drag_time > 0.1:
+                # Held still before letting go: no fling
+                self.velocity = 0.0
+        elif event.type == pygame.MOUSEMOTION and self.drag_y is not None:
+            now = time.time()
+            dy = self.drag_y - event.pos[1]
+            self.scroll_to(self.offset + dy)
+            if now > self.drag_time:
+                self.velocity = dy / (now - self.drag_time)
+            self.drag_y = event.pos[1]
+            self.drag_time = now
+
+    def scroll_to(self, offset):
+        self.offset = max(0.0, min(offset, self.max_scroll))
+        if self.offset in (0.0, self.max_scroll):
+            self.velocity = 0.0
+
+    def update(self):
+        now = time.time()
+        dt = min(now - self.last_update, 0.1)
+        self.last_update = now
+        if self.drag_y is not None or not self.velocity:
+            return
+        # Integrate the exponentially decaying velocity exactly over dt
+        decay = math.exp(-FRICTION * dt)
+        self.scroll_to(self.offset + self.velocity * (1 - decay) / FRICTION)
+        self.velocity *= decay
+        if abs(self.velocity) < MIN_SPEED:
+            self.velocity = 0.0
+
+    def is_moving(self):
+        """Being dragged or still gliding after a fling"""
+        return self.drag_y is not None or bool(self.velocity)
+
+    def get_tile(self, index):
+        tile = self.tiles.get(index)
+        if tile is not None:
+            return tile
+        top = index * TILE_HEIGHT
+        height = min(TILE_HEIGHT, self.content_height - top)
+        tile = pygame.Surface((self.rect.width, height))
+        if pygame.display.get_surface() is not None:
+            tile = tile.convert()
+        tile.fill(self.background)
+        # Only lines overlapping this tile; a line cut by the edge is drawn on both tiles
+        first = max(0, (top - self.margin_y) // self.line_height - 1)
+        for i in range(first, len(self.lines)):
+            y = self.margin_y + i * self.line_height - top
+            if y >= height:
+                break
+            if self.lines[i]:
+                tile.blit(self.font.render(self.lines[i], True, self.color), (self.margin_x, y))
+        self.tiles[index] = tile
+        return tile
+
+    def draw(self, screen):
+        screen.set_clip(self.rect)
+        offset = int(self.offset)
+        # The tiles cover the rect, except below the end of a short document
+        content_bottom = self.rect.y + self.content_height - offset
+        if content_bottom < self.rect.bottom:
+            screen.fill(self.background, (self.rect.x, content_bottom,
+                                          self.rect.width, self.rect.bottom - content_bottom))
+        first = offset // TILE_HEIGHT
+        last = min((offset + self.rect.height - 1) // TILE_HEIGHT,
+                   (self.content_height - 1) // TILE_HEIGHT)
+        for index in range(first, last + 1):
+            y = self.rect.y + index * TILE_HEIGHT - offset
+            screen.blit(self.get_tile(index), (self.rect.x, y))
+        screen.set_clip(None)
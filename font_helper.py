@@ -1,49 +1,117 @@
 #!/usr/bin/env python3
 import pygame
 import platform
+import io
 import os
 
-def get_chinese_font(size=24):
-    """
-    Get a font that supports Chinese characters based on the operating system.
-    Falls back to default font if Chinese font is not found.
-    """
+# Fonts are shared by every scene: (family, size, bold, italic) -> pygame.font.Font
+_fonts = {}
+# Font files are read once per process; every size is built from the same bytes
+_font_data = {}
+_UNRESOLVED = object()
+_chinese_font_path = _UNRESOLVED
+# pygame.font.Font(None, size) renders its bundled font at this fraction of size
+DEFAULT_FONT_SCALE = 0.6875
+
+def _chinese_font_candidates():
     system = platform.system()
-    
-    chinese_fonts = []
-    
+
     if system == "Windows":
-        chinese_fonts = [
+        return [
             "C:/Windows/Fonts/simhei.ttf",
             "C:/Windows/Fonts/msyh.ttf",
             "C:/Windows/Fonts/simsun.ttc"
         ]
     elif system == "Darwin":  # macOS
-        chinese_fonts = [
+        return [
             "/System/Library/Fonts/STHeiti Medium.ttc",
             "/System/Library/Fonts/STHeiti Light.ttc",
             "/Library/Fonts/Songti.ttc",
             "/System/Library/Fonts/PingFang.ttc"
         ]
     elif system == "Linux":
-        chinese_fonts = [
+        return [
             "/usr/share/fonts/truetype/wqy/wqy-zenhei.ttc",
             "/usr/share/fonts/truetype/droid/DroidSansFallbackFull.ttf"
         ]
-    
-    # Try to load Chinese font
-    for font_path in chinese_fonts:
+    return []
+
+def _default_font_path():
+    path = os.path.join(os.path.dirname(pygame.font.__file__), pygame.font.get_default_font())
+    return path if os.path.exists(path) else None
+
+def _open_font(path, size):
+    """Font from a file read at most once; path None is pygame's default font"""
+    if path is None:
+        return pygame.font.Font(None, size)
+    data = _font_data.get(path)
+    if data is None:
+        with open(path, 'rb') as f:
+            data = f.read()
+        _font_data[path] = data
+    # Each font reads lazily from its own stream over the shared bytes
+    return pygame.font.Font(io.BytesIO(data), size)
+
+def _resolve_chinese_font(size):
+    """Find the first Chinese font that loads (filesystem probed only once)"""
+    global _chinese_font_path
+    for font_path in _chinese_font_candidates():
         if os.path.exists(font_path):
             try:
-                return pygame.font.Font(font_path, size)
-            except:
+                font = _open_font(font_path, size)
+            except Exception:
+                _font_data.pop(font_path, None)
                 continue
-    
-    # Fallback to default font if no Chinese font found
-    return pygame.font.Font(None, size)
+            _chinese_font_path = font_path
+            return font
+    _chinese_font_path = None
+    return None
+
+def get_font(family, size, bold=False, italic=False):
+    """
+    Shared font for family "chinese" or "default". Fonts are cached, so
+    callers must not change their style; ask for bold/italic instead.
+    """
+    key = (family, size, bold, italic)
+    font = _fonts.get(key)
+    if font is not None:
+        return font
+
+    font = None
+    if family == "chinese":
+        if _chinese_font_path is _UNRESOLVED:
+            font = _resolve_chinese_font(size)
+        elif _chinese_font_path is not None:
+            font = _open_font(_chinese_font_path, size)
+    if font is None:
+        # Default font, also the fallback if no Chinese font is found
+        path = _default_font_path()
+        if path is None:
+            font = _open_font(None, size)
+        else:
+            font = _open_font(path, max(1, int(size * DEFAULT_FONT_SCALE)))
+
+    font.set_bold(bold)
+    font.set_italic(italic)
+    _fonts[key] = font
+    return font
+
+def get_chinese_font(size=24, bold=False, italic=False):
+    """
+    Get a font that supports Chinese characters based on the operating system.
+    Falls back to default font if Chinese font is not found.
+    """
+    return get_font("chinese", size, bold, italic)
 
-def get_default_font(size=24):
+def get_default_font(size=24, bold=False, italic=False):
     """
     Get default system font for UI elements that don't need Chinese support.
     """
-    return pygame.font.Font(None, size)
\ No newline at end of file
+    return get_font("default", size, bold, italic)
+
+def preload_fonts(chinese=(), default=()):
+    """Load the font sizes a scene uses up front, so drawing never opens one"""
+    for size in chinese:
+        get_chinese_font(size)
+    for size in default:
+        get_default_font(size)
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+import time
+import pygame
+
+IDLE_FPS = 5  # Frame rate of a scene where nothing moves; keep 1/IDLE_FPS under sim_clock.MAX_FRAME_TIME
+IDLE_DELAY = 1.0  # Seconds of full rate after the last input or movement
+
+class FramePacer:
+    """
+    Ends each frame of the scene loop. While anything is happening the
+    frame rate is capped at the scene's fps as before. Once a scene says
+    it is idle (its optional is_idle() returns True: nothing walking,
+    animating or playing) and there has been no input for IDLE_DELAY, the
+    pacer instead blocks in pygame.event.wait() for up to 1/IDLE_FPS, so
+    a static screen costs next to no CPU. The first event wakes it: the
+    event is put back for the scene to handle and full rate resumes.
+    """
+
+    def __init__(self, clock, idle_fps=IDLE_FPS, idle_delay=IDLE_DELAY):
+        self.clock = clock
+        self.idle_fps = idle_fps
+        self.idle_delay = idle_delay
+        self.last_busy = time.perf_counter()
+        self.frame_start = self.last_busy
+        self.idle = False
+
+    def begin_frame(self):
+        """Call before the scene handles its events, which counts them as input"""
+        self.frame_start = time.perf_counter()
+        if pygame.event.peek():
+            self.last_busy = self.frame_start
+
+    def end_frame(self, scene, fps):
+        """Wait until the next frame is due"""
+        now = time.perf_counter()
+        is_idle = getattr(scene, "is_idle", None)
+        if is_idle is None or not is_idle():
+            self.last_busy = now
+        self.idle = now - self.last_busy >= self.idle_delay
+        if not self.idle:
+            self.clock.tick(fps)
+            return
+        timeout = 1.0 / self.idle_fps - (now - self.frame_start)
+        if timeout > 0:
+            event = pygame.event.wait(int(timeout * 1000))
+            if event.type != pygame.NOEVENT:
+                pygame.event.post(event)
+                self.last_busy = time.perf_counter()
+        # Keeps clock.get_time() the real length of the frame
+        self.clock.tick()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+import io
+import mmap
+import os
+import struct
+import pygame
+
+# Header: magic, version, width, height, frame count, fps; then frame count + 1
+# file offsets, then every frame as a JPEG between consecutive offsets
+HEADER = struct.Struct("<8sIIIId")
+OFFSET = struct.Struct("<Q")
+MAGIC = b"PGFRAMES"
+VERSION = 2
+FRAME_SIZE = (600, 1000)  # WINDOW_WIDTH x WINDOW_HEIGHT of the video scenes
+JPEG_QUALITY = 85
+# The clips the scenes open (zjt.py, pick.py); other videos in assets are not played
+CLIPS = [
+    "./assets/zjt.mp4",
+    "./assets/pick/sit.mp4",
+    "./assets/pick/pick.mp4",
+    "./assets/pick/monk_yes.MP4",
+    "./assets/pick/monk_no.MP4",
+]
+
+def store_path(video_path):
+    """Frame store baked from a clip, e.g. ./assets/zjt.mp4 -> ./assets/zjt.frames"""
+    return os.path.splitext(video_path)[0] + ".frames"
+
+class FrameStore:
+    """
+    A clip pre-transcoded by bake() into one JPEG per frame at the final
+    size, memory-mapped read-only. Any frame can be decoded on its own
+    with pygame's image loader, so playback needs no OpenCV and no seeking
+    through a codec, and opening a store costs the same whatever the clip
+    length. Played through a VideoStream, whose thread does the decoding.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            header = f.read(HEADER.size)
+            if len(header) < HEADER.size:
+                raise OSError(f"Truncated frame store {path}")
+            magic, version, width, height, frame_count, fps = HEADER.unpack(header)
+            if magic != MAGIC or version != VERSION:
+                raise OSError(f"Not a frame store (or an old one): {path}")
+            self.size = (width, height)
+            self.frame_count = frame_count
+            self.fps = fps
+            table = f.read(OFFSET.size * (frame_count + 1))
+            if len(table) < OFFSET.size * (frame_count + 1):
+                raise OSError(f"Truncated frame store {path}")
+            self.offsets = [offset for offset, in OFFSET.iter_unpack(table)]
+            if os.fstat(f.fileno()).st_size < self.offsets[-1]:
+                raise OSError(f"Truncated frame store {path}")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+
+    def decode(self, index):
+        """Decode one frame into a new surface (safe off the game thread)"""
+        data = self._view[self.offsets[index]:self.offsets[index + 1]]
+        return pygame.image.load(io.BytesIO(data), "frame.jpg")
+
+    def close(self):
+        self._view.release()
+        self._map.close()
+
+def is_current(video_path, size=FRAME_SIZE):
+    """Whether the clip's frame store exists, matches size and is newer than the clip"""
+    path = store_path(video_path)
+    try:
+        with open(path, 'rb') as f:
+            magic, version, width, height, frame_count, fps = HEADER.unpack(f.read(HEADER.size))
+    except (OSError, struct.error):
+        return False
+    if magic != MAGIC or version != VERSION or (width, height) != tuple(size):
+        return False
+    return os.path.getmtime(path) >= os.path.getmtime(video_path)
+
+def bake(video_path, size=FRAME_SIZE):
+    """Transcode a clip into its frame store (needs OpenCV; run at build time)"""
+    import cv2
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise OSError(f"Cannot open video {video_path}")
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    path = store_path(video_path)
+    temp_path = path + ".tmp"
+    # Frames are counted while reading: container headers are not always exact
+    frames = []
+    try:
+        while True:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frame = cv2.resize(frame, tuple(size), interpolation=cv2.INTER_AREA)
+            ok, data = cv2.imencode(".jpg", frame, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
+            if not ok:
+                raise OSError(f"Cannot encode frame {len(frames)} of {video_path}")
+            frames.append(data.tobytes())
+        offset = HEADER.size + OFFSET.size * (len(frames) + 1)
+        offsets = [offset]
+        for data in frames:
+            offset += len(data)
+            offsets.append(offset)
+        with open(temp_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, size[0], size[1], len(frames), fps))
+            f.write(b"".join(OFFSET.pack(offset) for offset in offsets))
+            for data in frames:
+                f.write(data)
+        os.replace(temp_path, path)
+    finally:
+        cap.release()
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return path, len(frames)
+
+def bake_all(force=False):
+    """Bake every clip the video scenes play"""
+    for video_path in CLIPS:
+        if not os.path.exists(video_path):
+            print(f"{video_path}: missing, skipped")
+            continue
+        if not force and is_current(video_path):
+            print(f"{video_path}: up to date")
+            continue
+        path, frame_count = bake(video_path)
+        size_mb = os.path.getsize(path) / (1024 * 1024)
+        print(f"{video_path}: {frame_count} frames -> {path} ({size_mb:.1f} MB)")
+
+if __name__ == "__main__":
+    import sys
+    bake_all(force="--force" in sys.argv)
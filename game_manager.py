@@ -1,39 +1,238 @@
 #!/usr/bin/env python3
+import atexit
 import json
 import os
 import time
+from contextlib import contextmanager
 from datetime import datetime
 from typing import Dict, Any, Optional, Tuple
+from save_journal import ResourceJournal
+from save_lock import SaveLock
+from save_writer import SaveWriter
+
+# Fields owned by the resource journal: on a merge they come from the newer
+# snapshot and are then rebuilt by replaying the journal, never merged by hand
+JOURNALED_FIELDS = {
+    ('player', 'mp'), ('player', 'coins'),
+    ('statistics', 'total_coins_earned'), ('statistics', 'total_coins_spent'),
+    ('statistics', 'total_mp_generated'), ('statistics', 'total_mp_consumed'),
+    ('statistics', 'total_upgrades'), ('prayer_wheel', 'total_mp_generated'),
+    ('journal_seq',), ('save_revision',),
+}
+# Counters that two processes may both bump: merged as disk + local increase
+ADDITIVE_FIELDS = {
+    ('player', 'total_play_time'),
+    ('statistics', 'buildings_completed'), ('prayer_wheel', 'total_spins'),
+}
+# What a journal record sets besides the resource deltas (see _apply_change)
+CHANGE_RESOURCES = 0  # Nothing
+CHANGE_INCOME = 1  # Building target's income collected up to time value
+CHANGE_MP_USE = 2  # Building target's MP consumed up to time value
+CHANGE_UPGRADE = 3  # Structure target upgraded to level value, paid by the coins delta
+CHANGE_PRAYER = 4  # MP delta is from the prayer wheel, with temple bonus value
+# Buildings by their number in journal records; structure targets are
+# building number * 16 + structure number. Never reorder.
+JOURNAL_BUILDINGS = ('temple1', 'temple2', 'hotel1', 'restaurant1', 'apt1')
+_MISSING = object()
 
 class GameManager:
     def __init__(self):
         self.save_file = "game_save.json"
         self.game_data = None
         self.last_save_time = time.time()
+        self.save_interval = 5.0  # Write pending changes at most every 5 seconds
+        self.dirty = False
+        # Journal mode: coin/MP changes are appended to a small delta log and
+        # only folded into the full snapshot every journal_compact_threshold records
+        self.journal_enabled = True
+        self.journal = ResourceJournal("game_save.changes")
+        self.journal_seq = 0
+        self.journal_compact_threshold = 500
+        # Every scene runs in its own process: all reads and writes of the save
+        # and journal happen under one file lock, and snapshots carry a revision
+        # so a process can only replace the save it last saw (compare-and-swap)
+        self.lock = SaveLock("game_save.lock")
+        self.refresh_interval = 1.0  # Pick up other processes' changes this often
+        self.flush_retries = 3  # Blocking flushes retry snapshots that lost a race
+        self.last_refresh_time = time.time()
+        self._disk_revision = 0
+        self._seen_counter = None  # Lock-file revision counter when we last looked
+        self._base_text = None  # Save file contents the local data is based on
+        self._unjournaled = []  # Changes only carried by the next snapshot
+        # Changes made inside transaction(): applied, not yet journaled
+        self._transaction_depth = 0
+        self._pending = []  # [(timestamp, mp_delta, coins_delta, kind, target, value)]
+        # Snapshots are serialized here and written atomically on a background thread
+        self.writer = SaveWriter(self.save_file, fsync=True,
+                                 on_written=self._on_snapshot_written,
+                                 on_error=self._on_snapshot_failed,
+                                 lock=self.lock,
+                                 before_write=self._snapshot_still_current)
         self.last_income_update = time.time()
         self.income_update_interval = 60  # Update income every 60 seconds (1 minute)
+        self.completion_listeners = []
+        with self.lock:
+            self.journal.import_legacy("game_save.journal")
         self.load_game_data()
         
     def load_game_data(self) -> Dict[str, Any]:
         """Load game data from save file, create default if not exists"""
-        if os.path.exists(self.save_file):
-            try:
-                with open(self.save_file, 'r') as f:
-                    self.game_data = json.load(f)
-                # Update last save time
-                if self.game_data['player']['last_save_time']:
-                    # Calculate offline earnings
-                    self._calculate_offline_earnings()
-                # Recalculate building levels based on structure levels
-                self._recalculate_all_building_levels()
-            except Exception as e:
-                print(f"Error loading save file: {e}")
+        # Write pending changes first so re-reading the file doesn't drop them
+        self.flush(wait=True)
+        old_counts = self._get_completion_counts()
+        with self.lock:
+            if os.path.exists(self.save_file):
+                try:
+                    self.game_data = self._read_snapshot(self.save_file)
+                    # Replay resource changes made after this snapshot was written
+                    self._replay_journal()
+                    # Update last save time
+                    if self.game_data['player']['last_save_time']:
+                        # Calculate offline earnings
+                        self._calculate_offline_earnings()
+                    # Recalculate building levels based on structure levels
+                    self._recalculate_all_building_levels()
+                except Exception as e:
+                    print(f"Error loading save file: {e}")
+                    self._create_default_save()
+            else:
                 self._create_default_save()
-        else:
-            self._create_default_save()
         
+        self._notify_completion_changes(old_counts)
         return self.game_data
     
+    def refresh(self):
+        """
+        Catch up with changes other scene processes made to the save, without a
+        full reload: a newer snapshot is merged into the local data (local edits
+        win per field, shared counters are added up) and new journal records
+        are applied. Local unsaved changes are kept.
+        """
+        if self.game_data is None:
+            return self.load_game_data()
+        old_counts = self._get_completion_counts()
+        with self.lock:
+            self.last_refresh_time = time.time()
+            counter = self.lock.read_counter()
+            if counter != self._seen_counter and os.path.exists(self.save_file):
+                try:
+                    with open(self.save_file, 'r') as f:
+                        text = f.read()
+                    disk = json.loads(text)
+                except (OSError, ValueError) as e:
+                    # Mid-replace on a filesystem without atomic rename; next refresh retries
+                    print(f"Error reading save file: {e}")
+                    disk = None
+                if disk is not None:
+                    if disk.get('save_revision', 0) != self._disk_revision:
+                        self._merge_snapshot(disk, text)
+                    self._seen_counter = counter
+            # Resource changes other processes journaled since we last looked
+            for record in self.journal.read_new(self.journal_seq):
+                self._apply_change(*record[2:])
+                self.journal_seq = record[0]
+        self._notify_completion_changes(old_counts)
+        return self.game_data
+    
+    def _read_snapshot(self, path: str) -> Dict[str, Any]:
+        """Load a snapshot and remember it as the base for later merges (lock held)"""
+        with open(path, 'r') as f:
+            text = f.read()
+        data = json.loads(text)
+        self._base_text = text
+        self._disk_revision = data.get('save_revision', 0)
+        self._seen_counter = self.lock.read_counter()
+        self._unjournaled = []
+        return data
+    
+    def _merge_snapshot(self, disk: Dict[str, Any], text: str):
+        """Three-way merge of a newer snapshot from another process (lock held)"""
+        base = json.loads(self._base_text) if self._base_text else {}
+        self._merge_dict(self.game_data, base, disk, ())
+        # Journaled resources now match the disk snapshot; rebuild from its journal position
+        self.journal_seq = disk.get('journal_seq', 0)
+        for record in self.journal.read_records(after_seq=self.journal_seq):
+            self._apply_change(*record[2:])
+            self.journal_seq = record[0]
+        for change in self._unjournaled + self._pending:
+            self._apply_change(*change[1:])
+        self._base_text = text
+        self._disk_revision = disk.get('save_revision', 0)
+        self._recalculate_all_building_levels()
+    
+    def _merge_dict(self, ours: Dict[str, Any], base: Dict[str, Any], disk: Dict[str, Any], path: tuple):
+        for key in list(ours.keys() | disk.keys()):
+            field = path + (key,)
+            mine = ours.get(key, _MISSING)
+            theirs = disk.get(key, _MISSING)
+            old = base.get(key, _MISSING)
+            if field in JOURNALED_FIELDS or mine == old:
+                # Not changed here: take whatever the other process has
+                if theirs is _MISSING:
+                    ours.pop(key, None)
+                else:
+                    ours[key] = theirs
+            elif theirs == old:
+                continue  # Only changed here
+            elif isinstance(mine, dict) and isinstance(theirs, dict):
+                self._merge_dict(mine, old if isinstance(old, dict) else {}, theirs, field)
+            elif field in ADDITIVE_FIELDS and all(isinstance(v, (int, float)) for v in (mine, theirs, old)):
+                ours[key] = theirs + (mine - old)
+            # Otherwise both changed the same field: the local value wins
+    
+    def _notify_completion_changes(self, old_counts: Optional[Dict[str, int]]):
+        """Let listeners react to completions made elsewhere (e.g. another scene)"""
+        if old_counts is None:
+            return
+        for building_name, count in self._get_completion_counts().items():
+            if old_counts.get(building_name) != count:
+                self._notify_completion_change(building_name)
+    
+    def _replay_journal(self):
+        """Apply journaled changes that are newer than the loaded snapshot"""
+        self.journal_seq = self.game_data.get('journal_seq', 0)
+        records = self.journal.read_records(after_seq=self.journal_seq)
+        for record in records:
+            self._apply_change(*record[2:])
+            self.journal_seq = record[0]
+            
+        if records:
+            # Offline time starts at the last journaled change, not the snapshot
+            last_change = datetime.fromtimestamp(records[-1][1])
+            snapshot_time = self.game_data['player']['last_save_time']
+            if not snapshot_time or last_change > datetime.fromisoformat(snapshot_time):
+                self.game_data['player']['last_save_time'] = last_change.isoformat()
+    
+    def _get_completion_counts(self) -> Optional[Dict[str, int]]:
+        """Snapshot completion_count of every building, None if nothing is loaded"""
+        if not self.game_data:
+            return None
+        return {name: building.get('completion_count', 0)
+                for name, building in self.game_data['buildings'].items()}
+    
+    def add_completion_listener(self, callback):
+        """Register callback(building_name, completion_count), called when a completion count changes"""
+        if callback not in self.completion_listeners:
+            self.completion_listeners.append(callback)
+    
+    def remove_completion_listener(self, callback):
+        """Unregister a completion listener"""
+        if callback in self.completion_listeners:
+            self.completion_listeners.remove(callback)
+    
+    def set_completion_count(self, building_name: str, completion_count: int):
+        """Set how many times a building was completed and notify listeners"""
+        building = self.get_building_data(building_name)
+        if building.get('completion_count', 0) == completion_count:
+            return
+        building['completion_count'] = completion_count
+        self._notify_completion_change(building_name)
+    
+    def _notify_completion_change(self, building_name: str):
+        count = self.get_building_data(building_name).get('completion_count', 0)
+        for callback in list(self.completion_listeners):
+            callback(building_name, count)
+    
     def _recalculate_all_building_levels(self):
         """Recalculate building levels for all buildings based on structure levels"""
         for building_name in ['temple1', 'temple2', 'hotel1', 'restaurant1', 'apt1']:
@@ -47,27 +246,202 @@ class GameManager:
         self._update_island_level()
     
     def _create_default_save(self):
-        """Create default save file from the template"""
-        with open(self.save_file, 'r') as f:
-            self.game_data = json.load(f)
-        self.save_game_data()
+        """Create default save file from the template, preferring the last good backup"""
+        last_error = None
+        for path in (self.writer.backup_path, self.save_file):
+            if not os.path.exists(path):
+                continue
+            try:
+                self.game_data = self._read_snapshot(path)
+                self._replay_journal()
+                self.save_game_data()
+                return
+            except (OSError, ValueError) as e:
+                last_error = e
+        raise RuntimeError(f"No usable save file or backup: {last_error}")
     
     def save_game_data(self):
-        """Save current game data to file"""
-        self.game_data['player']['last_save_time'] = datetime.now().isoformat()
-        try:
-            with open(self.save_file, 'w') as f:
-                json.dump(self.game_data, f, indent=2)
+        """Schedule current game data to be written on the next flush"""
+        self.dirty = True
+    
+    def _needs_snapshot(self) -> bool:
+        """Whether the full save must be rewritten (pending changes or a long journal)"""
+        return self.dirty or self.journal.record_count >= self.journal_compact_threshold
+    
+    def flush_if_due(self):
+        """Write pending changes if save_interval has passed since the last write"""
+        if time.time() - self.last_refresh_time >= self.refresh_interval:
+            self.refresh()
+        if self._needs_snapshot() and time.time() - self.last_save_time >= self.save_interval:
+            self.flush()
+    
+    def flush(self, wait: bool = False):
+        """
+        Hand pending changes to the save writer now (scene exit, shutdown,
+        critical moments). With wait=True, block until they are on disk.
+        """
+        # The snapshot must not hold resource changes the journal doesn't know about
+        self._commit_pending()
+        for attempt in range(self.flush_retries):
+            if self._needs_snapshot() and self.game_data is not None:
+                self._submit_snapshot()
+            if not wait:
+                return
+            self.writer.wait()
+            if not self.dirty:
+                return
+            # Lost a race with another scene's save: merge its changes and try again
+    
+    def _submit_snapshot(self):
+        with self.lock:
+            # Fold in other processes' changes so the snapshot doesn't undo them
+            self.refresh()
+            base_revision = self._disk_revision
+            self.game_data['player']['last_save_time'] = datetime.now().isoformat()
+            self.game_data['journal_seq'] = self.journal_seq
+            self.game_data['save_revision'] = base_revision + 1
+            # Serializing on the game thread gives the writer a consistent snapshot
+            text = json.dumps(self.game_data, indent=2)
+            self.dirty = False
             self.last_save_time = time.time()
-        except Exception as e:
-            print(f"Error saving game: {e}")
+            token = (self.journal_seq, base_revision, len(self._unjournaled), text)
+            self.writer.submit(text, token=token)
+    
+    def _snapshot_still_current(self, token) -> bool:
+        """Writer thread, lock held: only replace the save revision the snapshot was based on"""
+        journal_seq, base_revision, unjournaled, text = token
+        if self.lock.read_counter() != self._seen_counter or base_revision != self._disk_revision:
+            # Another process saved first; the next flush merges and retries
+            self.dirty = True
+            return False
+        return True
+    
+    def _on_snapshot_written(self, token):
+        """Writer thread: the snapshot holds every delta up to journal_seq, so compact"""
+        journal_seq, base_revision, unjournaled, text = token
+        self._base_text = text
+        self._disk_revision = base_revision + 1
+        self._seen_counter = self._disk_revision
+        self.lock.write_counter(self._disk_revision)
+        del self._unjournaled[:unjournaled]
+        try:
+            self.journal.discard_through(journal_seq)
+        except OSError as e:
+            # Harmless: records up to journal_seq are skipped on replay
+            print(f"Error compacting save journal: {e}")
+    
+    def _on_snapshot_failed(self, error: Exception):
+        """Writer thread: keep the data dirty so the next flush retries"""
+        self.dirty = True
+    
+    def close(self):
+        """Write everything pending and stop the save writer (process shutdown)"""
+        self.flush(wait=True)
+        self.writer.close()
+        self.journal.close()
     
     def get_player_resources(self) -> Tuple[float, float]:
         """Get current MP and Coins"""
         return self.game_data['player']['mp'], self.game_data['player']['coins']
     
+    @contextmanager
+    def transaction(self):
+        """
+        Gather the resource changes of a frame (arrival rewards, income, MP use)
+        and journal them with one lock and one write when the block ends.
+        Each change still updates game_data right away and becomes its own
+        journal record, so totals and statistics are the same as without it.
+        """
+        self._transaction_depth += 1
+        try:
+            yield self
+        finally:
+            self._transaction_depth -= 1
+            if self._transaction_depth == 0:
+                self._commit_pending()
+    
+    def _commit_pending(self):
+        """Journal the changes gathered by transaction()"""
+        if not self._pending:
+            return
+        with self.lock:
+            # Catch up first: sequence numbers are shared by all processes
+            self.refresh()
+            pending, self._pending = self._pending, []
+            records = [(self.journal_seq + i,) + change for i, change in enumerate(pending, 1)]
+            try:
+                self.journal.append_many(records)
+                self.journal_seq += len(records)
+                return
+            except OSError as e:
+                print(f"Error writing save journal: {e}")
+            self._unjournaled.extend(pending)
+            self.save_game_data()
+    
     def update_player_resources(self, mp_delta: float = 0, coins_delta: float = 0):
         """Update player MP and/or Coins"""
+        if not mp_delta and not coins_delta:
+            return
+        self._record_changes([(mp_delta, coins_delta, CHANGE_RESOURCES, 0, 0.0)])
+    
+    def _record_changes(self, changes):
+        """
+        Apply changes [(mp_delta, coins_delta, kind, target, value)] and journal
+        them with one write, so a resource change and what it pays for (an
+        upgrade, a collection time) reach disk together without a snapshot
+        """
+        if not changes:
+            return
+        now = time.time()
+        changes = [(now,) + tuple(change) for change in changes]
+        if self._transaction_depth and self.journal_enabled:
+            # Visible now, journaled when the transaction ends
+            for change in changes:
+                self._apply_change(*change[1:])
+            self._pending.extend(changes)
+            return
+        with self.lock:
+            if self.journal_enabled:
+                # Sequence numbers are shared by all processes: catch up before taking the next one
+                self.refresh()
+            for change in changes:
+                self._apply_change(*change[1:])
+            
+            if self.journal_enabled:
+                # Only the change goes to disk now; the snapshot catches up on compaction
+                try:
+                    self.journal.append_many([(self.journal_seq + i,) + change
+                                              for i, change in enumerate(changes, 1)])
+                    self.journal_seq += len(changes)
+                    return
+                except OSError as e:
+                    print(f"Error writing save journal: {e}")
+            self._unjournaled.extend(changes)
+            self.save_game_data()
+    
+    def _apply_change(self, mp_delta: float, coins_delta: float, kind: int = CHANGE_RESOURCES,
+                      target: int = 0, value: float = 0.0):
+        """Apply one journaled change (shared with journal replay)"""
+        self._apply_resource_delta(mp_delta, coins_delta)
+        if kind == CHANGE_INCOME:
+            self.get_building_data(JOURNAL_BUILDINGS[target])['last_income_collected'] = value
+        elif kind == CHANGE_MP_USE:
+            self.get_building_data(JOURNAL_BUILDINGS[target])['last_mp_consumed'] = value
+        elif kind == CHANGE_UPGRADE:
+            building_name = JOURNAL_BUILDINGS[target // 16]
+            structures = self.get_building_data(building_name)['structures']
+            structure = structures[sorted(structures)[target % 16]]
+            structure['level'] = int(value)
+            structure['is_built'] = True
+            self.game_data['statistics']['total_upgrades'] += 1
+            self._update_building_level(building_name)
+            self._update_island_level()
+        elif kind == CHANGE_PRAYER:
+            self.game_data['prayer_wheel']['total_mp_generated'] += mp_delta
+            self.game_data['prayer_wheel']['temple_level_bonus'] = value
+    
+    def _apply_resource_delta(self, mp_delta: float, coins_delta: float):
+        """Apply a resource change and its statistics (shared with journal replay)"""
         self.game_data['player']['mp'] = max(0, self.game_data['player']['mp'] + mp_delta)
         self.game_data['player']['coins'] = max(0, self.game_data['player']['coins'] + coins_delta)
         
@@ -81,8 +455,6 @@ class GameManager:
             self.game_data['statistics']['total_mp_generated'] += mp_delta
         elif mp_delta < 0:
             self.game_data['statistics']['total_mp_consumed'] += abs(mp_delta)
-        
-        self.save_game_data()
     
     def get_building_data(self, building_name: str) -> Dict[str, Any]:
         """Get data for a specific building"""
@@ -118,21 +490,10 @@ class GameManager:
         if coins < cost:
             return False
             
-        # Perform upgrade
-        structure['level'] = current_level + 1
-        structure['is_built'] = True
-        self.update_player_resources(coins_delta=-cost)
-        
-        # Update building level (minimum of all structures)
-        self._update_building_level(building_name)
-        
-        # Update island level
-        self._update_island_level()
-        
-        # Update statistics
-        self.game_data['statistics']['total_upgrades'] += 1
-        
-        self.save_game_data()
+        # Perform upgrade: the charge and the new level are one journal record
+        # (_apply_change also updates building and island level and statistics)
+        target = JOURNAL_BUILDINGS.index(building_name) * 16 + sorted(building['structures']).index(structure_id)
+        self._record_changes([(0, -cost, CHANGE_UPGRADE, target, current_level + 1)])
         return True
     
     def calculate_upgrade_cost(self, building_name: str, structure_id: str, target_level: int) -> float:
@@ -297,13 +658,10 @@ class GameManager:
         # Calculate income
         income = income_rate * hours_elapsed
         
-        # Update last collection time
-        building['last_income_collected'] = current_time
-        
-        # Add to player coins
-        if income > 0:
-            self.update_player_resources(coins_delta=income)
-            
+        # Add to player coins; the new collection time goes into the same
+        # journal record, so a restart doesn't pay it again
+        self._record_changes([(0, max(income, 0), CHANGE_INCOME,
+                               JOURNAL_BUILDINGS.index(building_name), current_time)])
         return income
     
     def consume_mp(self, building_name: str) -> float:
@@ -332,18 +690,17 @@ class GameManager:
         
         # Check if we have enough MP
         current_mp = self.game_data['player']['mp']
+        apt = JOURNAL_BUILDINGS.index(building_name)
         if current_mp >= mp_needed:
-            # Update last consumption time
-            building['last_mp_consumed'] = current_time
-            # Consume MP
-            self.update_player_resources(mp_delta=-mp_needed)
+            # Consume MP and update last consumption time
+            self._record_changes([(-mp_needed, 0, CHANGE_MP_USE, apt, current_time)])
             return mp_needed
         else:
             # Partial consumption
             if mp_rate > 0:
                 partial_hours = current_mp / mp_rate
-                building['last_mp_consumed'] = last_consumed + (partial_hours * 3600)
-                self.update_player_resources(mp_delta=-current_mp)
+                self._record_changes([(-current_mp, 0, CHANGE_MP_USE, apt,
+                                       last_consumed + (partial_hours * 3600))])
             return current_mp
     
     def generate_mp(self, mp_amount: float):
@@ -357,14 +714,8 @@ class GameManager:
         bonus_multiplier = 1 + (0.05 * avg_temple_level)
         total_mp = mp_amount * bonus_multiplier
         
-        # Update player MP
-        self.update_player_resources(mp_delta=total_mp)
-        
-        # Update prayer wheel stats
-        self.game_data['prayer_wheel']['total_mp_generated'] += total_mp
-        self.game_data['prayer_wheel']['temple_level_bonus'] = avg_temple_level
-        
-        self.save_game_data()
+        # Update player MP and prayer wheel stats in one journal record
+        self._record_changes([(total_mp, 0, CHANGE_PRAYER, 0, avg_temple_level)])
         return total_mp
     
     def get_island_level(self) -> int:
@@ -385,6 +736,8 @@ class GameManager:
         if building:
             building['workers_assigned'] = workers
             self.save_game_data()
+            # Written right away, but the game never waits for the disk
+            self.flush()
     
     def get_total_workers(self) -> int:
         """Get total worker capacity from all Workers Houses"""
@@ -422,6 +775,8 @@ class GameManager:
         
         total_income = 0
         total_mp_consumed = 0
+        # New collection times, journaled with the income in one write
+        changes = []
         
         # Process income for all buildings with assigned workers
         for building_name, building in self.game_data['buildings'].items():
@@ -435,7 +790,7 @@ class GameManager:
                 total_income += building_income
                 
                 # Update last collection time
-                building['last_income_collected'] = current_time
+                changes.append((0, 0, CHANGE_INCOME, JOURNAL_BUILDINGS.index(building_name), current_time))
         
         # Handle MP consumption for Workers House
         apt_data = self.game_data['buildings'].get('apt1', {})
@@ -447,7 +802,7 @@ class GameManager:
             current_mp = self.game_data['player']['mp']
             if current_mp >= mp_needed:
                 total_mp_consumed = mp_needed
-                apt_data['last_mp_consumed'] = current_time
+                changes.append((0, 0, CHANGE_MP_USE, JOURNAL_BUILDINGS.index('apt1'), current_time))
             else:
                 # Partial consumption - reduce income proportionally
                 if mp_needed > 0:
@@ -456,17 +811,22 @@ class GameManager:
                     total_mp_consumed = current_mp
                     # Update partial consumption time
                     partial_hours = current_mp / mp_rate if mp_rate > 0 else 0
-                    apt_data['last_mp_consumed'] = self.last_income_update + (partial_hours * 3600)
+                    changes.append((0, 0, CHANGE_MP_USE, JOURNAL_BUILDINGS.index('apt1'),
+                                    self.last_income_update + (partial_hours * 3600)))
                 else:
                     total_mp_consumed = 0
         
         # Apply income and MP changes
         if total_income > 0 or total_mp_consumed > 0:
-            self.update_player_resources(mp_delta=-total_mp_consumed, coins_delta=total_income)
+            changes.append((-total_mp_consumed, total_income, CHANGE_RESOURCES, 0, 0.0))
+        self._record_changes(changes)
         
         # Update the last income update time
         self.last_income_update = current_time
 
 
 # Global instance
-game_manager = GameManager()
\ No newline at end of file
+game_manager = GameManager()
+
+# Never lose coalesced changes when the process exits
+atexit.register(game_manager.close)
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+import pygame
+from game_manager import game_manager
+from text_cache import render_text
+
+class HudLabel:
+    """A line of text showing a value; only re-rendered when the shown value changes"""
+
+    def __init__(self, font, template, color):
+        self.font = font
+        self.template = template  # e.g. "Coins: {}"
+        self.color = color
+        self.value = None
+        self.surface = None
+
+    def get_surface(self, value):
+        if self.surface is None or value != self.value:
+            self.value = value
+            self.surface = render_text(self.font, self.template.format(value), self.color)
+        return self.surface
+
+    def draw(self, screen, pos, value):
+        screen.blit(self.get_surface(value), pos)
+
+class ResourceHUD:
+    """
+    The MP and Coins panel at the top of every scene. The translucent
+    background is built once and each number is re-rendered only when its
+    integer part changes, so drawing it is three blits.
+    """
+
+    def __init__(self, font, pos, size=(200, 60), coins_offset=25,
+                 mp_color=(0, 0, 255), coins_color=(255, 215, 0)):
+        self.pos = pos
+        self.background = pygame.Surface(size)
+        self.background.fill((200, 200, 200))
+        self.background.set_alpha(200)
+        self.mp_pos = (pos[0] + 10, pos[1] + 5)
+        self.coins_pos = (pos[0] + 10, pos[1] + 5 + coins_offset)
+        self.mp_label = HudLabel(font, "MP: {}", mp_color)
+        self.coins_label = HudLabel(font, "Coins: {}", coins_color)
+
+    def draw(self, screen):
+        mp, coins = game_manager.get_player_resources()
+        screen.blit(self.background, self.pos)
+        self.mp_label.draw(screen, self.mp_pos, int(mp))
+        self.coins_label.draw(screen, self.coins_pos, int(coins))
@@ -2,11 +2,19 @@
 import pygame
 import random
 import time
-import subprocess
-from collections import deque
-import os
 from game_manager import game_manager
+from scene_manager import scene_manager
+from sim_clock import sim_clock
+from route_table import RouteTable
+from crowd import Crowd
 from font_helper import get_chinese_font, get_default_font
+from asset_cache import get_character_sprites, load_image, load_scaled, load_scaled_by, preload_characters
+from text_cache import render_text
+from dirty_rect import DirtyRenderer
+from viewport import SpatialGrid, Viewport, centered_bounds
+from tiled_map import TiledMap
+from text_layout import render_wrapped
+from hud import HudLabel, ResourceHUD
 
 # Initialize Pygame
 pygame.init()
@@ -58,6 +66,9 @@ CONNECTIONS = {
     "T2": ["C1"]
 }
 
+# Every route between two locations, looked up instead of searched
+ROUTES = RouteTable(LOCATIONS, CONNECTIONS)
+
 # Building info
 BUILDING_INFO = {
     "BT1": {
@@ -74,7 +85,7 @@ BUILDING_INFO = {
     },
     "BA1": {
         "text": "Apartment is a quiet area for all the employees to rest, it features an apartment complex, a coffee, a gym and a cafeteria!",
-        "script": "apt1.py"
+        "script": "APT1.py"
     },
     "BH1": {
         "text": "Hotel area is on the west side of the island, consist of 5 hotels from a 3 star to 5 star!",
@@ -82,9 +93,21 @@ BUILDING_INFO = {
     }
 }
 
+# Icons shown on the main map once a building has been completed
+COMPLETED_ICONS = {
+    "Temple1": "./assets/mainmap/t1.png",
+    "Temple2": "./assets/mainmap/t2.png",
+    "Hotel1": "./assets/mainmap/h1.png",
+    "Restaurant1": "./assets/mainmap/r1.png",
+    "Apt1": "./assets/mainmap/a1.png"
+}
+
+EMPTY_LAND_ICON = "./assets/emptyland.png"
+
 class Map:
     def __init__(self):
-        self.background = pygame.image.load("./assets/mainmap/mainmap.png")
+        # Drawn tile by tile; only tiles near the screen are kept in memory
+        self.background = TiledMap("./assets/mainmap/mainmap.png")
         self.bg_rect = self.background.get_rect()
         self.bg_rect.center = (WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2)
         self.drag_start = None
@@ -146,11 +169,11 @@ class Map:
         self.animating = True
         self.anim_start_pos = (self.bg_rect.x, self.bg_rect.y)
         self.anim_target_pos = (desired_x, desired_y)
-        self.anim_start_time = time.time()
+        self.anim_start_time = sim_clock.now()
         
     def update(self):
         if self.animating:
-            current_time = time.time()
+            current_time = sim_clock.now()
             elapsed = current_time - self.anim_start_time
             progress = min(elapsed / self.anim_duration, 1.0)
             
@@ -171,7 +194,7 @@ class Map:
             return 1 - pow(-2 * t + 2, 3) / 2
         
     def draw(self, screen):
-        screen.blit(self.background, self.bg_rect)
+        self.background.draw(screen, self.bg_rect.topleft)
         
     def world_to_screen(self, world_pos):
         return (world_pos[0] + self.bg_rect.x, world_pos[1] + self.bg_rect.y)
@@ -184,10 +207,16 @@ class Building:
         self.name = data["name"]
         self.level = 0
         self.save_name = self._get_save_name()
-        self.icon = pygame.image.load("./assets/emptyland.png")
-        self.icon = pygame.transform.scale(self.icon, 
-                                         (int(self.icon.get_width() * 0.5), 
-                                          int(self.icon.get_height() * 0.5)))
+        
+        # Preload both icon states so swapping icons never touches disk
+        self.empty_icon = load_scaled_by(EMPTY_LAND_ICON, 0.5)
+        try:
+            # Completed buildings keep their original size
+            self.completed_icon = load_image(COMPLETED_ICONS[self.name])
+        except (KeyError, pygame.error, FileNotFoundError):
+            # Fallback to empty land if icon doesn't exist
+            self.completed_icon = self.empty_icon
+        self.icon = self.empty_icon
         self.rect = self.icon.get_rect(center=self.center)
         self.button_rect = pygame.Rect(0, 0, 150, 150)
         self.button_rect.center = self.center
@@ -208,42 +237,18 @@ class Building:
     def upgrade(self):
         self.level = 1
         
-    def update_icon(self):
+    def update_icon(self, completion_count=None):
         """Update building icon based on completion status"""
-        building_data = game_manager.get_building_data(self.save_name)
-        completion_count = building_data.get('completion_count', 0)
+        if completion_count is None:
+            building_data = game_manager.get_building_data(self.save_name)
+            completion_count = building_data.get('completion_count', 0)
         
         if completion_count > 0:
             # Building has been completed - show upgraded icon from mainmap folder
-            if self.name == "Temple1":
-                icon_path = "./assets/mainmap/t1.png"
-            elif self.name == "Temple2":
-                icon_path = "./assets/mainmap/t2.png"
-            elif self.name == "Hotel1":
-                icon_path = "./assets/mainmap/h1.png"
-            elif self.name == "Restaurant1":
-                icon_path = "./assets/mainmap/r1.png"
-            elif self.name == "Apt1":
-                icon_path = "./assets/mainmap/a1.png"
-            else:
-                icon_path = "./assets/emptyland.png"
+            self.icon = self.completed_icon
         else:
             # Building not completed - show empty land
-            icon_path = "./assets/emptyland.png"
-            
-        try:
-            self.icon = pygame.image.load(icon_path)
-            # Only scale empty land - keep completed buildings at original size
-            if completion_count == 0:
-                self.icon = pygame.transform.scale(self.icon, 
-                                                 (int(self.icon.get_width() * 0.5), 
-                                                  int(self.icon.get_height() * 0.5)))
-        except:
-            # Fallback to empty land if icon doesn't exist
-            self.icon = pygame.image.load("./assets/emptyland.png")
-            self.icon = pygame.transform.scale(self.icon, 
-                                             (int(self.icon.get_width() * 0.5), 
-                                              int(self.icon.get_height() * 0.5)))
+            self.icon = self.empty_icon
         
     def handle_click(self, screen_pos, map_obj):
         world_pos = (screen_pos[0] - map_obj.bg_rect.x, 
@@ -258,13 +263,14 @@ class Building:
         screen.blit(self.icon, screen_rect)
 
 class Character:
-    def __init__(self, char_type, spawn_pos):
+    def __init__(self, char_type, spawn_pos, crowd=None):
         self.type = char_type
         self.pos = list(spawn_pos)
         self.destination = random.choice(["R1", "H1", "T2", "T1", "A1"])
-        self.path = []
-        self.speed = 0.5
-        self.spawn_time = time.time()
+        self.path = ()
+        self.path_index = 0
+        self.speed = 0.5  # Pixels per simulation step
+        self.spawn_time = sim_clock.now()
         self.lifetime = 120  # 2 minutes
         self.state = "MOVING"  # MOVING, AT_DESTINATION, DISAPPOINTED, SATISFIED_LEAVING
         self.visible = True
@@ -275,76 +281,90 @@ class Character:
         # Animation
         self.direction = 3  # 1=left, 2=right, 3=down, 4=up
         self.frame = 0
-        self.last_frame_change = time.time()
+        self.last_frame_change = sim_clock.now()
         self.frame_duration = 0.25
         
-        # Load character sprites
-        self.sprites = {}
-        for direction in range(1, 5):
-            self.sprites[direction] = []
-            for frame in range(1, 5):
-                img_path = f"./assets/characters/c{char_type}_{direction}-{frame}.png"
-                img = pygame.image.load(img_path)
-                img = pygame.transform.scale(img, 
-                                           (int(img.get_width() * 0.5), 
-                                            int(img.get_height() * 0.5)))
-                self.sprites[direction].append(img)
+        # Character sprites are shared by every visitor through the asset cache
+        self.sprites = get_character_sprites(char_type, 0.5)
                 
-        # Load icon sprites
+        # Load icon sprites (scaled once per process)
         self.icons = {
-            "sleepy": pygame.image.load("./assets/sleepy.png"),
-            "burger": pygame.image.load("./assets/burger.png"),
-            "budda": pygame.image.load("./assets/budda.png"),
-            "bye": pygame.image.load("./assets/bye.png"),
-            "thumbsup": pygame.image.load("./assets/coin.png")
+            "sleepy": load_scaled_by("./assets/sleepy.png", 0.5),
+            "burger": load_scaled_by("./assets/burger.png", 0.5),
+            "budda": load_scaled_by("./assets/budda.png", 0.5),
+            "bye": load_scaled_by("./assets/bye.png", 0.5),
+            "thumbsup": load_scaled_by("./assets/coin.png", 0.5)
         }
         
-        # Scale icons
-        for key in self.icons:
-            self.icons[key] = pygame.transform.scale(self.icons[key],
-                                                    (int(self.icons[key].get_width() * 0.5),
-                                                     int(self.icons[key].get_height() * 0.5)))
+        # With a crowd, position, facing and animation live in its arrays
+        self.crowd = crowd
+        self.slot = None
+        if crowd is not None:
+            self.slot = crowd.add(self, self.pos, self.speed, self.last_frame_change)
         
         # Calculate initial path
         self.calculate_path()
         
-    def calculate_path(self):
-        start = self.find_nearest_location(self.pos)
-        end = self.destination
-        self.path = self.bfs_pathfind(start, end)
-        
-    def find_nearest_location(self, pos):
-        min_dist = float('inf')
-        nearest = None
-        for loc, loc_pos in LOCATIONS.items():
-            dist = ((pos[0] - loc_pos[0])**2 + (pos[1] - loc_pos[1])**2)**0.5
-            if dist < min_dist:
-                min_dist = dist
-                nearest = loc
-        return nearest
-        
-    def bfs_pathfind(self, start, end):
-        if start == end:
-            return [end]
-            
-        queue = deque([(start, [start])])
-        visited = {start}
+    def set_speed(self, speed):
+        self.speed = speed
+        if self.crowd is not None:
+            self.crowd.speed[self.slot] = speed
         
-        while queue:
-            current, path = queue.popleft()
-            
-            for neighbor in CONNECTIONS.get(current, []):
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    new_path = path + [neighbor]
-                    if neighbor == end:
-                        return new_path
-                    queue.append((neighbor, new_path))
-                    
-        return []
+    def get_position(self):
+        if self.crowd is not None:
+            return self.crowd.position(self.slot)
+        return self.pos
+        
+    def calculate_path(self):
+        start = ROUTES.nearest(self.get_position())
+        # Routes are shared by every character: walk them by index, never modify
+        self.path = ROUTES.route(start, self.destination)
+        self.path_index = 0
+        if self.crowd is not None:
+            self.crowd.set_route(self.slot, self.path)
+        
+    def next_wake(self):
+        """Earliest time update() has work to do without reaching a waypoint"""
+        wake = float('inf')
+        if self.destination != "B1":
+            wake = self.spawn_time + self.lifetime
+        if self.state == "AT_DESTINATION" and self.arrival_time:
+            wake = min(wake, self.arrival_time + self.stay_duration)
+        return wake
+        
+    def move_along_path(self):
+        """Step towards the next waypoint; returns the waypoint reached, if any"""
+        if self.crowd is not None:
+            # The crowd already moved everyone this frame
+            return self.crowd.take_arrival(self.slot)
+        if self.path_index >= len(self.path):
+            return None
+        next_loc = LOCATIONS[self.path[self.path_index]]
+        dx = next_loc[0] - self.pos[0]
+        dy = next_loc[1] - self.pos[1]
+        dist = (dx**2 + dy**2)**0.5
+        
+        if dist < 10:  # Reached waypoint
+            self.pos = list(next_loc)
+            arrived_at = self.path[self.path_index]
+            self.path_index += 1
+            return arrived_at
+        
+        # Move towards next waypoint
+        move_x = (dx / dist) * self.speed
+        move_y = (dy / dist) * self.speed
+        self.pos[0] += move_x
+        self.pos[1] += move_y
+        
+        # Update direction
+        if abs(dx) > abs(dy):
+            self.direction = 1 if dx < 0 else 2
+        else:
+            self.direction = 4 if dy < 0 else 3
+        return None
         
     def update(self, buildings):
-        current_time = time.time()
+        current_time = sim_clock.now()
         
         # Check lifetime
         if current_time - self.spawn_time > self.lifetime and self.destination != "B1":
@@ -352,7 +372,7 @@ class Character:
             self.calculate_path()
             
         # Update animation frame
-        if current_time - self.last_frame_change > self.frame_duration:
+        if self.crowd is None and current_time - self.last_frame_change > self.frame_duration:
             self.frame = (self.frame + 1) % 4
             self.last_frame_change = current_time
             
@@ -371,71 +391,53 @@ class Character:
                 
         elif self.state == "MOVING" or self.state == "DISAPPOINTED" or self.state == "SATISFIED_LEAVING":
             # Move along path
-            if self.path:
-                next_loc = LOCATIONS[self.path[0]]
-                dx = next_loc[0] - self.pos[0]
-                dy = next_loc[1] - self.pos[1]
-                dist = (dx**2 + dy**2)**0.5
+            arrived_at = self.move_along_path()
+            if arrived_at is not None:
+                # Check if reached main road and was satisfied leaving
+                if self.state == "SATISFIED_LEAVING" and arrived_at in ["C1", "C2", "C3", "C4"]:
+                    self.state = "MOVING"  # Change back to normal state
                 
-                if dist < 10:  # Reached waypoint
-                    self.pos = list(next_loc)
-                    arrived_at = self.path.pop(0)
-                    
-                    # Check if reached main road and was satisfied leaving
-                    if self.state == "SATISFIED_LEAVING" and arrived_at in ["C1", "C2", "C3", "C4"]:
-                        self.state = "MOVING"  # Change back to normal state
-                    
-                    # Check if reached destination
-                    if arrived_at == self.destination:
-                        if self.destination == "B1":
-                            return False  # Remove character
+                # Check if reached destination
+                if arrived_at == self.destination:
+                    if self.destination == "B1":
+                        return False  # Remove character
+                    else:
+                        # Check structure completion count - if > 0, always satisfied
+                        structure_completion = 0
+                        if self.destination == "T1":
+                            structure_completion = game_manager.get_building_data('temple1').get('completion_count', 0)
+                        elif self.destination == "T2":
+                            structure_completion = game_manager.get_building_data('temple2').get('completion_count', 0)
+                        elif self.destination == "R1":
+                            structure_completion = game_manager.get_building_data('restaurant1').get('completion_count', 0)
+                        elif self.destination == "H1":
+                            structure_completion = game_manager.get_building_data('hotel1').get('completion_count', 0)
+                        elif self.destination == "A1":
+                            structure_completion = game_manager.get_building_data('apt1').get('completion_count', 0)
+                        
+                        if structure_completion > 0:
+                            # Structure has been completed at least once - always satisfied
+                            self.state = "AT_DESTINATION"
+                            self.visible = False
+                            self.arrival_time = current_time
+                            # Reward player with 10 coins for successful arrival
+                            game_manager.update_player_resources(coins_delta=10)
                         else:
-                            # Check structure completion count - if > 0, always satisfied
-                            structure_completion = 0
-                            if self.destination == "T1":
-                                structure_completion = game_manager.get_building_data('temple1').get('completion_count', 0)
-                            elif self.destination == "T2":
-                                structure_completion = game_manager.get_building_data('temple2').get('completion_count', 0)
-                            elif self.destination == "R1":
-                                structure_completion = game_manager.get_building_data('restaurant1').get('completion_count', 0)
-                            elif self.destination == "H1":
-                                structure_completion = game_manager.get_building_data('hotel1').get('completion_count', 0)
-                            elif self.destination == "A1":
-                                structure_completion = game_manager.get_building_data('apt1').get('completion_count', 0)
-                            
-                            if structure_completion > 0:
-                                # Structure has been completed at least once - always satisfied
+                            # Structure never completed - check building level
+                            building_level = self.get_building_level(self.destination, buildings)
+                            if building_level >= 1:
                                 self.state = "AT_DESTINATION"
                                 self.visible = False
                                 self.arrival_time = current_time
                                 # Reward player with 10 coins for successful arrival
                                 game_manager.update_player_resources(coins_delta=10)
                             else:
-                                # Structure never completed - check building level
-                                building_level = self.get_building_level(self.destination, buildings)
-                                if building_level >= 1:
-                                    self.state = "AT_DESTINATION"
-                                    self.visible = False
-                                    self.arrival_time = current_time
-                                    # Reward player with 10 coins for successful arrival
-                                    game_manager.update_player_resources(coins_delta=10)
-                                else:
-                                    self.state = "DISAPPOINTED"
-                                    self.destination = "B1"
-                                    self.calculate_path()
-                else:
-                    # Move towards next waypoint
-                    move_x = (dx / dist) * self.speed
-                    move_y = (dy / dist) * self.speed
-                    self.pos[0] += move_x
-                    self.pos[1] += move_y
-                    
-                    # Update direction
-                    if abs(dx) > abs(dy):
-                        self.direction = 1 if dx < 0 else 2
-                    else:
-                        self.direction = 4 if dy < 0 else 3
-                        
+                                self.state = "DISAPPOINTED"
+                                self.destination = "B1"
+                                self.calculate_path()
+        
+        if self.crowd is not None:
+            self.crowd.update_agent(self.slot, self.state != "AT_DESTINATION", self.next_wake())
         return True
         
     def get_building_level(self, arrival_point, buildings):
@@ -482,16 +484,20 @@ class Character:
         if not self.visible:
             return
             
-        screen_pos = map_obj.world_to_screen(self.pos)
+        if self.crowd is not None:
+            pos, direction, frame = self.crowd.sprite_state(self.slot, sim_clock.alpha)
+        else:
+            pos, direction, frame = self.pos, self.direction, self.frame
+        screen_pos = map_obj.world_to_screen(pos)
         
         # Draw character sprite
-        sprite = self.sprites[self.direction][self.frame]
+        sprite = self.sprites[direction][frame]
         char_rect = sprite.get_rect(center=screen_pos)
         screen.blit(sprite, char_rect)
         
         # Draw disappointment text
         if self.state == "DISAPPOINTED":
-            text = font.render(self.get_disappointment_text(), True, RED)
+            text = render_text(font, self.get_disappointment_text(), RED)
             text_rect = text.get_rect(center=(screen_pos[0], screen_pos[1] - 40))
             screen.blit(text, text_rect)
         else:
@@ -505,7 +511,7 @@ class UpgradeButton:
     def __init__(self, building_key):
         self.building_key = building_key
         self.info = BUILDING_INFO[building_key]
-        self.button_img = pygame.image.load("./assets/upgrade_button.png")
+        self.button_img = load_image("./assets/upgrade_button.png")
         self.rect = self.button_img.get_rect()
         self.visible = False
         self.building_center = BUILDINGS[building_key]["center"]
@@ -527,9 +533,8 @@ class UpgradeButton:
         # Check if click is on right half of button
         button_rect = pygame.Rect(self.rect.x + 100, self.rect.y, 100, self.rect.height)
         if button_rect.collidepoint(world_pos):
-            # Open the script
-            script_path = os.path.join(os.path.dirname(__file__), self.info["script"])
-            subprocess.Popen(["python3", script_path])
+            # Open the building's scene on top of the main map
+            scene_manager.push(self.info["script"])
             return True
         return False
         
@@ -541,38 +546,19 @@ class UpgradeButton:
         screen_rect.center = map_obj.world_to_screen(self.rect.center)
         screen.blit(self.button_img, screen_rect)
         
-        # Draw text on left side
-        text_lines = []
-        words = self.info["text"].split()
-        current_line = ""
-        for word in words:
-            test_line = current_line + word + " "
-            if font.size(test_line)[0] < 90:
-                current_line = test_line
-            else:
-                if current_line:
-                    text_lines.append(current_line.strip())
-                current_line = word + " "
-        if current_line:
-            text_lines.append(current_line.strip())
-            
-        y_offset = screen_rect.y + 10
-        for line in text_lines:
-            text_surf = font.render(line, True, BLACK)
-            screen.blit(text_surf, (screen_rect.x + 5, y_offset))
-            y_offset += 15
+        # Draw text on left side (wrapped and rendered once, then reused)
+        text_panel = render_wrapped(self.info["text"], font, 90, BLACK, 15)
+        screen.blit(text_panel, (screen_rect.x + 5, screen_rect.y + 10))
 
 class UIButton:
     def __init__(self, center, size, image_path, script):
-        self.image = pygame.image.load(image_path)
-        self.image = pygame.transform.scale(self.image, size)
+        self.image = load_scaled(image_path, size)
         self.rect = self.image.get_rect(center=center)
         self.script = script
         
     def handle_click(self, pos):
         if self.rect.collidepoint(pos):
-            script_path = os.path.join(os.path.dirname(__file__), self.script)
-            subprocess.Popen(["python3", script_path])
+            scene_manager.push(self.script)
             return True
         return False
         
@@ -581,15 +567,20 @@ class UIButton:
 
 class Game:
     def __init__(self):
-        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-        pygame.display.set_caption("Puto Island Game")
-        self.clock = pygame.time.Clock()
+        self.screen = scene_manager.get_display((WINDOW_WIDTH, WINDOW_HEIGHT), "Puto Island Game")
+        # Only the parts of the screen that changed are redrawn
+        self.renderer = DirtyRenderer()
+        # update() runs once per simulation step, not once per frame
+        self.fixed_timestep = True
         self.running = True
         self.font = get_chinese_font(12)
         self.ui_font = get_chinese_font(30)
+        self.island_label = HudLabel(self.ui_font, "Island Level: {}", RED)
+        # MP/Coins panel, re-rendered only when a number changes
+        self.resource_hud = ResourceHUD(self.ui_font, (WINDOW_WIDTH - 210, 10), (200, 40), coins_offset=20)
         
-        # Load game data
-        game_manager.load_game_data()
+        # Pick up changes other scenes made to the save
+        game_manager.refresh()
         
         # Initialize game objects
         self.map = Map()
@@ -603,9 +594,22 @@ class Game:
             self.buildings.append(building)
             self.upgrade_buttons[key] = UpgradeButton(key)
             
-        # Characters
+        # Off-screen objects are skipped; a building covers the area of either icon
+        self.viewport = Viewport(self.map, (WINDOW_WIDTH, WINDOW_HEIGHT))
+        self.building_grid = SpatialGrid()
+        for building in self.buildings:
+            self.building_grid.insert(building, centered_bounds(
+                building.center, (building.empty_icon, building.completed_icon)))
+            
+        # Swap building icons only when a completion count actually changes
+        game_manager.add_completion_listener(self._on_completion_changed)
+            
+        # Characters (sprites preloaded so spawning never touches disk)
+        preload_characters(0.5)
         self.characters = []
-        self.last_spawn = time.time()
+        # With NumPy, everyone walks in one batched step per simulation step
+        self.crowd = Crowd(LOCATIONS) if Crowd.available else None
+        self.last_spawn = sim_clock.now()
         self.spawn_interval = random.uniform(1, 10)
         
         # UI Buttons
@@ -622,16 +626,16 @@ class Game:
         self.last_income_update = time.time()
         
     def spawn_character(self):
-        current_time = time.time()
+        current_time = sim_clock.now()
         # Apply spawn speed multiplier from island level
         spawn_multiplier = game_manager.get_spawn_speed_multiplier()
         adjusted_interval = self.spawn_interval / spawn_multiplier
         
         if current_time - self.last_spawn > adjusted_interval:
             char_type = random.randint(1, 9)
-            character = Character(char_type, LOCATIONS["B1"])
+            character = Character(char_type, LOCATIONS["B1"], self.crowd)
             # Apply movement speed multiplier
-            character.speed *= game_manager.get_movement_speed_multiplier()
+            character.set_speed(character.speed * game_manager.get_movement_speed_multiplier())
             self.characters.append(character)
             self.last_spawn = current_time
             self.spawn_interval = random.uniform(1, 10)
@@ -649,7 +653,6 @@ class Game:
                 for button in self.ui_buttons:
                     if button.handle_click(event.pos):
                         ui_clicked = True
-                        self.running = False  # Exit main game when sub-game opens
                         break
                         
                 if not ui_clicked:
@@ -669,7 +672,6 @@ class Game:
                                         game_manager.save_game_data()
                                     break
                             upgrade_clicked = True
-                            self.running = False  # Exit main game when sub-game opens
                             break
                             
                     if not upgrade_clicked:
@@ -694,51 +696,82 @@ class Game:
         # Update passive income every minute
         game_manager.update_passive_income()
         
+        # Write coalesced save changes at most every save_interval seconds
+        game_manager.flush_if_due()
+        
         self.spawn_character()
         
         # Update map animation
         self.map.update()
         
         # Update characters
-        self.characters = [char for char in self.characters if char.update(self.buildings)]
-        
-        # Update building icons based on completion status
-        for building in self.buildings:
-            building.update_icon()
+        if self.crowd is not None:
+            self._update_crowd()
+        else:
+            self.characters = [char for char in self.characters if char.update(self.buildings)]
         
         # Update real-time income
         self._update_income()
         
+    def _update_crowd(self):
+        """Move everyone at once; only characters that arrived somewhere or whose timer is due run update()"""
+        gone = [char for char in self.crowd.step(sim_clock.now()) if not char.update(self.buildings)]
+        if gone:
+            for char in gone:
+                self.crowd.remove(char.slot)
+            self.characters = [char for char in self.characters if char not in gone]
+        
+    def is_idle(self):
+        """Nothing on screen moves: no one walking and no camera animation"""
+        return (not self.map.animating and not self.map.dragging
+                and not any(char.visible for char in self.characters))
+        
     def draw(self):
-        self.screen.fill(WHITE)
+        screen = self.renderer.begin(self.screen)
+        screen.fill(WHITE)
         
         # Draw map
-        self.map.draw(self.screen)
+        self.map.draw(screen)
         
         # Draw buildings
-        for building in self.buildings:
-            building.draw(self.screen, self.map)
+        view = self.viewport.world_rect()
+        for building in self.building_grid.query(view):
+            building.draw(screen, self.map)
             
         # Draw characters
-        for character in self.characters:
-            character.draw(self.screen, self.map, self.font)
+        for character in self.viewport.visible_characters(self.characters, self.crowd):
+            character.draw(screen, self.map, self.font)
             
         # Draw upgrade buttons
         for upgrade_btn in self.upgrade_buttons.values():
-            upgrade_btn.draw(self.screen, self.map, self.font)
+            if upgrade_btn.visible and view.colliderect(upgrade_btn.rect):
+                upgrade_btn.draw(screen, self.map, self.font)
             
         # Draw UI buttons
         for button in self.ui_buttons:
-            button.draw(self.screen)
+            button.draw(screen)
             
         # Draw MP and Coins display
-        self._draw_resources()
+        self._draw_resources(screen)
         
         # Draw Island Level
-        self._draw_island_level()
+        self._draw_island_level(screen)
             
-        pygame.display.flip()
+        self.renderer.present()
+        
+    def on_resume(self):
+        """Back from a building or mini-game: the click that opened it never got its mouse-up"""
+        self.map.dragging = False
+        
+    def on_exit(self):
+        game_manager.remove_completion_listener(self._on_completion_changed)
         
+    def _on_completion_changed(self, building_name, completion_count):
+        """Update the matching building icon when its completion count changes"""
+        for building in self.buildings:
+            if building.save_name == building_name:
+                building.update_icon(completion_count)
+                
     def _load_building_levels(self):
         """Load building levels from save data"""
         for building in self.buildings:
@@ -746,32 +779,17 @@ class Game:
             if building_data and building_data.get('is_upgraded'):
                 building.level = 1
                 
-    def _draw_resources(self):
+    def _draw_resources(self, screen):
         """Draw MP and Coins at top of screen"""
-        mp, coins = game_manager.get_player_resources()
-        
-        # Draw background for resources
-        resource_bg = pygame.Surface((200, 40))
-        resource_bg.fill((200, 200, 200))
-        resource_bg.set_alpha(200)
-        self.screen.blit(resource_bg, (WINDOW_WIDTH - 210, 10))
+        self.resource_hud.draw(screen)
         
-        # Draw MP
-        mp_text = self.ui_font.render(f"MP: {int(mp)}", True, (0, 0, 255))
-        self.screen.blit(mp_text, (WINDOW_WIDTH - 200, 15))
-        
-        # Draw Coins
-        coins_text = self.ui_font.render(f"Coins: {int(coins)}", True, (255, 215, 0))
-        self.screen.blit(coins_text, (WINDOW_WIDTH - 200, 35))
-        
-    def _draw_island_level(self):
+    def _draw_island_level(self, screen):
         """Draw island level at top left"""
-        island_level = game_manager.get_island_level()
-        level_text = self.ui_font.render(f"Island Level: {island_level}", True, RED)
-        self.screen.blit(level_text, (10, 10))
+        self.island_label.draw(screen, (10, 10), game_manager.get_island_level())
         
     def _update_income(self):
         """Update real-time income collection"""
+        # Wall clock, like game_manager's income: it is paid for real time, not game time
         current_time = time.time()
         if current_time - self.last_income_update > 1:  # Update every second
             # Collect income from all buildings
@@ -785,13 +803,7 @@ class Game:
             self.last_income_update = current_time
         
     def run(self):
-        while self.running:
-            self.handle_events()
-            self.update()
-            self.draw()
-            self.clock.tick(FPS)
-            
-        pygame.quit()
+        scene_manager.run(self)
 
 if __name__ == "__main__":
     game = Game()
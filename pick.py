@@ -1,26 +1,32 @@
 #!/usr/bin/env python3
 import pygame
-import cv2
 import random
 import os
-import sys
-import subprocess
-from font_helper import get_chinese_font, get_default_font
+from font_helper import get_chinese_font, get_default_font, preload_fonts
+from asset_cache import load_image
+from text_cache import render_text
+from scene_manager import scene_manager
+from video_stream import open_video
+from document_view import DocumentView
 
 pygame.init()
 
 WINDOW_WIDTH = 600
 WINDOW_HEIGHT = 1000
-screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-pygame.display.set_caption("Pick Game")
-
-clock = pygame.time.Clock()
+FPS = 30
+VIDEO_BUFFER_FRAMES = 4  # Frames decoded ahead per open clip
+VIDEO_FRAME_WAIT = 0.005  # Longest a frame waits for the decoder before the last one is shown again
 
 class VideoPlayer:
     def __init__(self, video_path, loop=False):
         self.video_path = video_path
-        self.cap = cv2.VideoCapture(video_path)
-        self.fps = self.cap.get(cv2.CAP_PROP_FPS)
+        # Frames are decoded, converted and resized ahead on the stream's own thread
+        try:
+            self.stream = open_video(video_path, (WINDOW_WIDTH, WINDOW_HEIGHT),
+                                     buffer_frames=VIDEO_BUFFER_FRAMES, loop=loop)
+        except OSError as e:
+            print(f"Error opening video: {e}")
+            self.stream = None
         self.frame_count = 0
         self.playing = False
         self.loop = loop
@@ -30,28 +36,18 @@ class VideoPlayer:
         
     def stop(self):
         self.playing = False
-        self.cap.release()
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
         
     def get_frame(self):
         if not self.playing:
             return None
             
-        ret, frame = self.cap.read()
-        if not ret:
-            if self.loop:
-                self.cap.release()
-                self.cap = cv2.VideoCapture(self.video_path)
-                ret, frame = self.cap.read()
-                if not ret:
-                    self.playing = False
-                    return None
-            else:
-                self.playing = False
-                return None
-            
-        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        frame = cv2.resize(frame, (WINDOW_WIDTH, WINDOW_HEIGHT))
-        frame = pygame.surfarray.make_surface(frame.swapaxes(0, 1))
+        # A late frame repeats the previous one; None means the clip has ended
+        frame = self.stream.next_frame(timeout=VIDEO_FRAME_WAIT) if self.stream is not None else None
+        if frame is None:
+            self.playing = False
         return frame
         
     def is_playing(self):
@@ -59,7 +55,7 @@ class VideoPlayer:
 
 class Button:
     def __init__(self, image_path, position):
-        self.image = pygame.image.load(image_path)
+        self.image = load_image(image_path)
         self.rect = self.image.get_rect(center=position)
         self.visible = True
         
@@ -103,6 +99,12 @@ class TextButton:
 
 class Game:
     def __init__(self):
+        self.screen = scene_manager.get_display((WINDOW_WIDTH, WINDOW_HEIGHT), "Pick Game")
+        self.running = True
+        self.fps = FPS
+        # Document, popup and button text sizes
+        preload_fonts(chinese=(24, 30, 40))
+        self.frame = None
         self.state = "INITIAL"
         self.current_video = None
         self.pick_button = Button("./assets/pick/pick_button.png", (300, 850))
@@ -110,17 +112,32 @@ class Game:
         self.back_button = TextButton("BACK", (300, 850))
         self.main_back_button = Button("./assets/back.png", (550, 30))
         self.current_doc_text = None
+        self.document_view = None
         self.popup_active = False
         self.background = None
-        self.doc_scroll_offset = 0
-        self.doc_line_height = 35
+        # Clips the state machine can play next, already decoding: {path: VideoPlayer}
+        self.prefetched = {}
+        self.reset_to_initial()
         
     def load_video(self, video_path, loop=False):
         if self.current_video:
             self.current_video.stop()
-        self.current_video = VideoPlayer(video_path, loop)
+        video = self.prefetched.pop(video_path, None)
+        if video is None or video.loop != loop:
+            video = VideoPlayer(video_path, loop)
+        self.current_video = video
         self.current_video.play()
         
+    def prefetch(self, *videos):
+        """Open the given (path, loop) clips ahead of time and close other prefetched ones"""
+        wanted = dict(videos)
+        for path in list(self.prefetched):
+            if path not in wanted:
+                self.prefetched.pop(path).stop()
+        for path, loop in videos:
+            if path not in self.prefetched:
+                self.prefetched[path] = VideoPlayer(path, loop)
+        
     def load_document(self, doc_number):
         doc_path = f"./assets/pick/docs/{doc_number}.txt"
         try:
@@ -128,33 +145,16 @@ class Game:
                 self.current_doc_text = f.read()
         except:
             self.current_doc_text = f"Document {doc_number} not found"
+        # Laid out once; the area above the button scrolls over pre-rendered tiles
+        self.document_view = DocumentView(self.current_doc_text, get_chinese_font(24),
+                                          (0, 0, WINDOW_WIDTH, WINDOW_HEIGHT - 200))
             
     def draw_document(self, screen):
-        if not self.current_doc_text:
+        if not self.document_view:
             return
             
         screen.fill((20, 20, 20))
-        font = get_chinese_font(24)
-        
-        lines = self.current_doc_text.split('\n')
-        y = 50 - self.doc_scroll_offset
-        
-        # Create a clipping rectangle to ensure text doesn't overlap with button
-        clip_rect = pygame.Rect(0, 0, WINDOW_WIDTH, WINDOW_HEIGHT - 200)
-        screen.set_clip(clip_rect)
-        
-        for line in lines:
-            if y > -self.doc_line_height and y < WINDOW_HEIGHT - 200:  # Only draw visible lines
-                text_surface = font.render(line, True, (255, 255, 255))
-                screen.blit(text_surface, (50, y))
-            y += self.doc_line_height
-            
-        # Reset clipping
-        screen.set_clip(None)
-        
-        # Calculate max scroll
-        total_height = len(lines) * self.doc_line_height
-        self.max_scroll = max(0, total_height - (WINDOW_HEIGHT - 250))
+        self.document_view.draw(screen)
                 
     def draw_popup(self, screen):
         popup_width = 400
@@ -166,7 +166,7 @@ class Game:
         pygame.draw.rect(screen, (255, 255, 255), (popup_x, popup_y, popup_width, popup_height), 3)
         
         font = get_chinese_font(40)
-        text = font.render("Pick Again?", True, (255, 255, 255))
+        text = render_text(font, "Pick Again?", (255, 255, 255))
         text_rect = text.get_rect(center=(WINDOW_WIDTH // 2, popup_y + 60))
         screen.blit(text, text_rect)
         
@@ -175,115 +175,127 @@ class Game:
     def reset_to_initial(self):
         self.state = "INITIAL"
         self.load_video("./assets/pick/sit.mp4", loop=True)
+        self.prefetch(("./assets/pick/pick.mp4", False))
         self.pick_button.show()
         self.continue_button.hide()
         self.back_button.hide()
         self.current_doc_text = None
+        self.document_view = None
         self.popup_active = False
         self.background = None
-        self.doc_scroll_offset = 0
         
-    def run(self):
-        running = True
-        self.reset_to_initial()
-        
-        while running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    running = False
-                elif event.type == pygame.MOUSEWHEEL:
-                    if self.state == "SHOW_DOCUMENT":
-                        # Scroll up/down with mouse wheel
-                        self.doc_scroll_offset -= event.y * 30
-                        self.doc_scroll_offset = max(0, min(self.doc_scroll_offset, self.max_scroll))
-                elif event.type == pygame.MOUSEBUTTONDOWN:
-                    if self.main_back_button.is_clicked(event.pos):
-                        pygame.quit()
-                        subprocess.Popen([sys.executable, "main_game.py"])
-                        sys.exit()
-                    elif self.popup_active:
-                        yes_pos, no_pos = self.draw_popup(screen)
-                        yes_rect = pygame.Rect(yes_pos[0] - 40, yes_pos[1] - 20, 80, 40)
-                        no_rect = pygame.Rect(no_pos[0] - 40, no_pos[1] - 20, 80, 40)
-                        
-                        if yes_rect.collidepoint(event.pos):
-                            self.reset_to_initial()
-                        elif no_rect.collidepoint(event.pos):
-                            pygame.quit()
-                            subprocess.Popen([sys.executable, "main_game.py"])
-                            sys.exit()
-                    elif self.state == "INITIAL" and self.pick_button.is_clicked(event.pos):
-                        self.pick_button.hide()
-                        self.load_video("./assets/pick/pick.mp4")
-                        self.state = "PICKING"
-                    elif self.state == "SHOW_CONTINUE" and self.continue_button.is_clicked(event.pos):
-                        doc_number = random.randint(1, 4)
-                        self.load_document(doc_number)
-                        self.state = "SHOW_DOCUMENT"
-                        self.continue_button.hide()
-                        self.back_button.show()
-                        self.doc_scroll_offset = 0
-                        self.max_scroll = 0
-                    elif self.state == "SHOW_DOCUMENT" and self.back_button.is_clicked(event.pos):
+    def handle_events(self):
+        for event in pygame.event.get():
+            if self.state == "SHOW_DOCUMENT" and self.document_view:
+                # Wheel and drag scrolling
+                self.document_view.handle_event(event)
+            if event.type == pygame.QUIT:
+                self.running = False
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                if self.main_back_button.is_clicked(event.pos):
+                    scene_manager.back()
+                    return
+                elif self.popup_active:
+                    yes_pos, no_pos = self.draw_popup(self.screen)
+                    yes_rect = pygame.Rect(yes_pos[0] - 40, yes_pos[1] - 20, 80, 40)
+                    no_rect = pygame.Rect(no_pos[0] - 40, no_pos[1] - 20, 80, 40)
+                    
+                    if yes_rect.collidepoint(event.pos):
                         self.reset_to_initial()
-                        
-            if self.current_video and self.current_video.is_playing():
-                frame = self.current_video.get_frame()
-                if frame:
-                    screen.blit(frame, (0, 0))
-                else:
-                    if self.state == "PICKING":
-                        choice = random.choice(["YES", "NO"])
-                        if choice == "YES":
-                            self.load_video("./assets/pick/monk_yes.MP4")
-                            self.state = "SHOWING_MONK_YES"
-                        else:
-                            self.load_video("./assets/pick/monk_no.MP4")
-                            self.state = "SHOWING_MONK_NO"
-                    elif self.state == "SHOWING_MONK_YES":
-                        self.state = "SHOW_CONTINUE"
-                        self.continue_button.show()
-                        self.current_video = None
-                        self.background = pygame.image.load("./assets/pick/bg2.png")
-                    elif self.state == "SHOWING_MONK_NO":
-                        self.state = "SHOW_POPUP"
-                        self.popup_active = True
-                        self.current_video = None
-                        self.background = pygame.image.load("./assets/pick/bg1.png")
-            elif self.state == "SHOW_DOCUMENT":
-                self.draw_document(screen)
-            elif self.state == "SHOW_POPUP":
-                if self.background:
-                    screen.blit(self.background, (0, 0))
-                else:
-                    screen.fill((0, 0, 0))
-                yes_pos, no_pos = self.draw_popup(screen)
-                font = get_chinese_font(30)
-                yes_text = font.render("Yes", True, (255, 255, 255))
-                no_text = font.render("No", True, (255, 255, 255))
-                pygame.draw.rect(screen, (100, 100, 100), (yes_pos[0] - 40, yes_pos[1] - 20, 80, 40))
-                pygame.draw.rect(screen, (100, 100, 100), (no_pos[0] - 40, no_pos[1] - 20, 80, 40))
-                screen.blit(yes_text, (yes_pos[0] - 15, yes_pos[1] - 10))
-                screen.blit(no_text, (no_pos[0] - 15, no_pos[1] - 10))
-            elif self.state == "SHOW_CONTINUE":
-                if self.background:
-                    screen.blit(self.background, (0, 0))
-                else:
-                    screen.fill((0, 0, 0))
+                    elif no_rect.collidepoint(event.pos):
+                        scene_manager.back()
+                        return
+                elif self.state == "INITIAL" and self.pick_button.is_clicked(event.pos):
+                    self.pick_button.hide()
+                    self.load_video("./assets/pick/pick.mp4")
+                    self.state = "PICKING"
+                    # Either outcome can follow the pick
+                    self.prefetch(("./assets/pick/monk_yes.MP4", False), ("./assets/pick/monk_no.MP4", False))
+                elif self.state == "SHOW_CONTINUE" and self.continue_button.is_clicked(event.pos):
+                    doc_number = random.randint(1, 4)
+                    self.load_document(doc_number)
+                    self.state = "SHOW_DOCUMENT"
+                    self.continue_button.hide()
+                    self.back_button.show()
+                elif self.state == "SHOW_DOCUMENT" and self.back_button.is_clicked(event.pos):
+                    self.reset_to_initial()
+                    
+    def update(self):
+        if self.state == "SHOW_DOCUMENT" and self.document_view:
+            self.document_view.update()
+        self.frame = None
+        if self.current_video and self.current_video.is_playing():
+            self.frame = self.current_video.get_frame()
+            if not self.frame:
+                if self.state == "PICKING":
+                    choice = random.choice(["YES", "NO"])
+                    if choice == "YES":
+                        self.load_video("./assets/pick/monk_yes.MP4")
+                        self.state = "SHOWING_MONK_YES"
+                    else:
+                        self.load_video("./assets/pick/monk_no.MP4")
+                        self.state = "SHOWING_MONK_NO"
+                    # Every path leads back to the sitting loop eventually
+                    self.prefetch(("./assets/pick/sit.mp4", True))
+                elif self.state == "SHOWING_MONK_YES":
+                    self.state = "SHOW_CONTINUE"
+                    self.continue_button.show()
+                    self.current_video = None
+                    self.background = load_image("./assets/pick/bg2.png")
+                elif self.state == "SHOWING_MONK_NO":
+                    self.state = "SHOW_POPUP"
+                    self.popup_active = True
+                    self.current_video = None
+                    self.background = load_image("./assets/pick/bg1.png")
+                    
+    def is_idle(self):
+        """No video playing and the document, if shown, at rest"""
+        if self.current_video and self.current_video.is_playing():
+            return False
+        return not (self.state == "SHOW_DOCUMENT" and self.document_view and self.document_view.is_moving())
+        
+    def draw(self):
+        screen = self.screen
+        if self.current_video and self.current_video.is_playing():
+            if self.frame:
+                screen.blit(self.frame, (0, 0))
+        elif self.state == "SHOW_DOCUMENT":
+            self.draw_document(screen)
+        elif self.state == "SHOW_POPUP":
+            if self.background:
+                screen.blit(self.background, (0, 0))
             else:
                 screen.fill((0, 0, 0))
-                
-            self.pick_button.draw(screen)
-            self.continue_button.draw(screen)
-            self.back_button.draw(screen)
-            self.main_back_button.draw(screen)
-            
-            pygame.display.flip()
-            clock.tick(30)
+            yes_pos, no_pos = self.draw_popup(screen)
+            font = get_chinese_font(30)
+            yes_text = render_text(font, "Yes", (255, 255, 255))
+            no_text = render_text(font, "No", (255, 255, 255))
+            pygame.draw.rect(screen, (100, 100, 100), (yes_pos[0] - 40, yes_pos[1] - 20, 80, 40))
+            pygame.draw.rect(screen, (100, 100, 100), (no_pos[0] - 40, no_pos[1] - 20, 80, 40))
+            screen.blit(yes_text, (yes_pos[0] - 15, yes_pos[1] - 10))
+            screen.blit(no_text, (no_pos[0] - 15, no_pos[1] - 10))
+        elif self.state == "SHOW_CONTINUE":
+            if self.background:
+                screen.blit(self.background, (0, 0))
+            else:
+                screen.fill((0, 0, 0))
+        else:
+            screen.fill((0, 0, 0))
             
+        self.pick_button.draw(screen)
+        self.continue_button.draw(screen)
+        self.back_button.draw(screen)
+        self.main_back_button.draw(screen)
+        
+        pygame.display.flip()
+        
+    def on_exit(self):
         if self.current_video:
             self.current_video.stop()
-        pygame.quit()
+        self.prefetch()
+            
+    def run(self):
+        scene_manager.run(self)
 
 if __name__ == "__main__":
     game = Game()
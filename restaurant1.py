@@ -1,12 +1,19 @@
 #!/usr/bin/env python3
 import pygame
 import random
-import time
-import subprocess
-from collections import deque
 import os
 from game_manager import game_manager
+from scene_manager import scene_manager
+from sim_clock import sim_clock
+from route_table import RouteTable
+from crowd import Crowd
 from font_helper import get_chinese_font, get_default_font
+from asset_cache import get_animation, get_character_sprites, load_image, load_scaled, load_scaled_by, preload_characters
+from text_cache import render_text
+from dirty_rect import DirtyRenderer, draw_rect
+from viewport import SpatialGrid, Viewport, centered_bounds
+from tiled_map import TiledMap
+from hud import HudLabel, ResourceHUD
 
 # Initialize Pygame
 pygame.init()
@@ -44,6 +51,9 @@ CONNECTIONS = {
     "r1_6": ["r1_1", "r1_5"]
 }
 
+# Every route between two locations, looked up instead of searched
+ROUTES = RouteTable(LOCATIONS, CONNECTIONS)
+
 # Building centers for upgrade system
 BUILDING_CENTERS = [
     (173, 623),
@@ -65,7 +75,8 @@ RESTAURANT_EMOJIS = {
 
 class Map:
     def __init__(self):
-        self.background = pygame.image.load("./assets/restaurant/r1map.png")
+        # Drawn tile by tile; only tiles near the screen are kept in memory
+        self.background = TiledMap("./assets/restaurant/r1map.png")
         self.bg_rect = self.background.get_rect()
         self.bg_rect.center = (WINDOW_WIDTH // 2, WINDOW_HEIGHT // 2)
         self.drag_start = None
@@ -127,11 +138,11 @@ class Map:
         self.animating = True
         self.anim_start_pos = (self.bg_rect.x, self.bg_rect.y)
         self.anim_target_pos = (desired_x, desired_y)
-        self.anim_start_time = time.time()
+        self.anim_start_time = sim_clock.now()
         
     def update(self):
         if self.animating:
-            current_time = time.time()
+            current_time = sim_clock.now()
             elapsed = current_time - self.anim_start_time
             progress = min(elapsed / self.anim_duration, 1.0)
             
@@ -152,7 +163,7 @@ class Map:
             return 1 - pow(-2 * t + 2, 3) / 2
         
     def draw(self, screen):
-        screen.blit(self.background, self.bg_rect)
+        self.background.draw(screen, self.bg_rect.topleft)
         
     def world_to_screen(self, world_pos):
         return (world_pos[0] + self.bg_rect.x, world_pos[1] + self.bg_rect.y)
@@ -169,25 +180,13 @@ class Building:
         self.animation_cycle = 0
         self.showing_final = False
         
-        # Load construction images
-        self.construction_imgs = []
-        for i in range(1, 6):
-            img = pygame.image.load(f"./assets/mainmap/construction{i}.png")
-            img = pygame.transform.scale(img, (200, 200))
-            self.construction_imgs.append(img)
-            
-        self.construction_static = pygame.image.load("./assets/mainmap/construction.png")
-        self.construction_static = pygame.transform.scale(self.construction_static, (200, 200))
-        
-        # Load fireworks
-        self.fireworks = []
-        for i in range(1, 7):
-            img = pygame.image.load(f"./assets/fireworks/fireworks{i}.png")
-            img = pygame.transform.scale(img, (400, 500))
-            self.fireworks.append(img)
+        # Effect animations are shared by every building
+        self.construction_imgs = get_animation("construction")
+        self.construction_static = get_animation("construction_static")[0]
+        self.fireworks = get_animation("fireworks")
             
         # Load final building image
-        self.final_img = pygame.image.load(f"./assets/restaurant/r{index+1}.png")
+        self.final_img = load_image(f"./assets/restaurant/r{index+1}.png")
         
     def upgrade(self):
         if self.level < 5:
@@ -196,7 +195,7 @@ class Building:
             
     def start_animation(self):
         self.animating = True
-        self.animation_start = time.time()
+        self.animation_start = sim_clock.now()
         self.animation_frame = 0
         self.animation_cycle = 0
         if self.level < 5:
@@ -208,7 +207,7 @@ class Building:
         if not self.animating:
             return
             
-        current_time = time.time()
+        current_time = sim_clock.now()
         
         if self.animation_type == "construction":
             # Construction animation: 3 cycles of 5 frames, 0.2s each
@@ -256,16 +255,17 @@ class Building:
             screen.blit(self.construction_static, rect)
 
 class Character:
-    def __init__(self, char_type, spawn_pos):
+    def __init__(self, char_type, spawn_pos, crowd=None):
         self.type = char_type
         self.pos = list(spawn_pos)
         # Choose a different destination than spawn position
-        spawn_location = self.find_nearest_location(spawn_pos)
+        spawn_location = ROUTES.nearest(spawn_pos)
         possible_destinations = [loc for loc in LOCATIONS.keys() if loc != spawn_location]
         self.destination = random.choice(possible_destinations)
-        self.path = []
-        self.speed = 0.5
-        self.spawn_time = time.time()
+        self.path = ()
+        self.path_index = 0
+        self.speed = 0.5  # Pixels per simulation step
+        self.spawn_time = sim_clock.now()
         self.state = "MOVING"
         self.visible = True
         self.arrival_time = None
@@ -274,79 +274,91 @@ class Character:
         # Animation
         self.direction = 3
         self.frame = 0
-        self.last_frame_change = time.time()
+        self.last_frame_change = sim_clock.now()
         self.frame_duration = 0.25
         
-        # Load character sprites
-        self.sprites = {}
-        for direction in range(1, 5):
-            self.sprites[direction] = []
-            for frame in range(1, 5):
-                img_path = f"./assets/characters/c{char_type}_{direction}-{frame}.png"
-                img = pygame.image.load(img_path)
-                img = pygame.transform.scale(img, 
-                                           (int(img.get_width() * 0.4), 
-                                            int(img.get_height() * 0.4)))
-                self.sprites[direction].append(img)
+        # Character sprites are shared by every visitor through the asset cache
+        self.sprites = get_character_sprites(char_type, 0.4)
                 
-        # Load icon sprites
+        # Load icon sprites (scaled once per process)
         self.icons = {
-            "thumbsup": pygame.image.load("./assets/coin.png")
+            "thumbsup": load_scaled_by("./assets/coin.png", 0.5)
         }
         
         # Load restaurant emojis
         for emoji_key, emoji_path in RESTAURANT_EMOJIS.items():
-            self.icons[emoji_key] = pygame.image.load(emoji_path)
+            self.icons[emoji_key] = load_scaled_by(emoji_path, 0.5)
         
-        # Scale icons
-        for key in self.icons:
-            self.icons[key] = pygame.transform.scale(self.icons[key],
-                                                    (int(self.icons[key].get_width() * 0.5),
-                                                     int(self.icons[key].get_height() * 0.5)))
+        # With a crowd, position, facing and animation live in its arrays
+        self.crowd = crowd
+        self.slot = None
+        if crowd is not None:
+            self.slot = crowd.add(self, self.pos, self.speed, self.last_frame_change)
         
         # Calculate initial path
         self.calculate_path()
         
-    def calculate_path(self):
-        start = self.find_nearest_location(self.pos)
-        end = self.destination
-        self.path = self.bfs_pathfind(start, end)
-        
-    def find_nearest_location(self, pos):
-        min_dist = float('inf')
-        nearest = None
-        for loc, loc_pos in LOCATIONS.items():
-            dist = ((pos[0] - loc_pos[0])**2 + (pos[1] - loc_pos[1])**2)**0.5
-            if dist < min_dist:
-                min_dist = dist
-                nearest = loc
-        return nearest
-        
-    def bfs_pathfind(self, start, end):
-        if start == end:
-            return [end]
-            
-        queue = deque([(start, [start])])
-        visited = {start}
+    def set_speed(self, speed):
+        self.speed = speed
+        if self.crowd is not None:
+            self.crowd.speed[self.slot] = speed
         
-        while queue:
-            current, path = queue.popleft()
-            
-            for neighbor in CONNECTIONS.get(current, []):
-                if neighbor not in visited:
-                    visited.add(neighbor)
-                    new_path = path + [neighbor]
-                    if neighbor == end:
-                        return new_path
-                    queue.append((neighbor, new_path))
-                    
-        return []
+    def get_position(self):
+        if self.crowd is not None:
+            return self.crowd.position(self.slot)
+        return self.pos
+        
+    def calculate_path(self):
+        start = ROUTES.nearest(self.get_position())
+        # Routes are shared by every character: walk them by index, never modify
+        self.path = ROUTES.route(start, self.destination)
+        self.path_index = 0
+        if self.crowd is not None:
+            self.crowd.set_route(self.slot, self.path)
+        
+    def next_wake(self):
+        """Earliest time update() has work to do without reaching a waypoint"""
+        wake = float('inf')
+        if self.state == "AT_DESTINATION" and self.arrival_time:
+            wake = self.arrival_time + self.stay_duration
+        return wake
+        
+    def move_along_path(self):
+        """Step towards the next waypoint; returns the waypoint reached, if any"""
+        if self.crowd is not None:
+            # The crowd already moved everyone this frame
+            return self.crowd.take_arrival(self.slot)
+        if self.path_index >= len(self.path):
+            return None
+        next_loc = LOCATIONS[self.path[self.path_index]]
+        dx = next_loc[0] - self.pos[0]
+        dy = next_loc[1] - self.pos[1]
+        dist = (dx**2 + dy**2)**0.5
+        
+        if dist < 10:  # Reached waypoint
+            self.pos = list(next_loc)
+            arrived_at = self.path[self.path_index]
+            self.path_index += 1
+            return arrived_at
+        
+        # Move towards next waypoint
+        move_x = (dx / dist) * self.speed
+        move_y = (dy / dist) * self.speed
+        self.pos[0] += move_x
+        self.pos[1] += move_y
+        
+        # Update direction
+        if abs(dx) > abs(dy):
+            self.direction = 1 if dx < 0 else 2
+        else:
+            self.direction = 4 if dy < 0 else 3
+        return None
         
     def update(self, buildings):
-        current_time = time.time()
+        current_time = sim_clock.now()
         
         # Update animation frame
-        if current_time - self.last_frame_change > self.frame_duration:
+        if self.crowd is None and current_time - self.last_frame_change > self.frame_duration:
             self.frame = (self.frame + 1) % 4
             self.last_frame_change = current_time
             
@@ -357,35 +369,18 @@ class Character:
                 
         elif self.state == "MOVING":
             # Move along path
-            if self.path:
-                next_loc = LOCATIONS[self.path[0]]
-                dx = next_loc[0] - self.pos[0]
-                dy = next_loc[1] - self.pos[1]
-                dist = (dx**2 + dy**2)**0.5
-                
-                if dist < 10:  # Reached waypoint
-                    self.pos = list(next_loc)
-                    arrived_at = self.path.pop(0)
-                    
-                    # Check if reached destination
-                    if arrived_at == self.destination:
-                        self.state = "AT_DESTINATION"
-                        self.arrival_time = current_time
-                        # Reward player with 20 coins for successful arrival
-                        game_manager.update_player_resources(coins_delta=20)
-                else:
-                    # Move towards next waypoint
-                    move_x = (dx / dist) * self.speed
-                    move_y = (dy / dist) * self.speed
-                    self.pos[0] += move_x
-                    self.pos[1] += move_y
-                    
-                    # Update direction
-                    if abs(dx) > abs(dy):
-                        self.direction = 1 if dx < 0 else 2
-                    else:
-                        self.direction = 4 if dy < 0 else 3
+            arrived_at = self.move_along_path()
+            if arrived_at is not None:
+                # Check if reached destination
+                if arrived_at == self.destination:
+                    self.state = "AT_DESTINATION"
+                    self.arrival_time = current_time
+                    # Reward player with 20 coins for successful arrival
+                    game_manager.update_player_resources(coins_delta=20)
                         
+        
+        if self.crowd is not None:
+            self.crowd.update_agent(self.slot, self.state != "AT_DESTINATION", self.next_wake())
         return True
         
     def get_icon(self):
@@ -399,10 +394,14 @@ class Character:
         if not self.visible:
             return
             
-        screen_pos = map_obj.world_to_screen(self.pos)
+        if self.crowd is not None:
+            pos, direction, frame = self.crowd.sprite_state(self.slot, sim_clock.alpha)
+        else:
+            pos, direction, frame = self.pos, self.direction, self.frame
+        screen_pos = map_obj.world_to_screen(pos)
         
         # Draw character sprite
-        sprite = self.sprites[self.direction][self.frame]
+        sprite = self.sprites[direction][frame]
         char_rect = sprite.get_rect(center=screen_pos)
         screen.blit(sprite, char_rect)
         
@@ -420,23 +419,22 @@ class UpgradeButton:
         self.rect = pygame.Rect(self.pos, self.size)
         
         # Load icon
-        self.icon = pygame.image.load(f"./assets/restaurant/r{index+1}_icon.png")
-        self.icon = pygame.transform.scale(self.icon, (64, 64))
+        self.icon = load_scaled(f"./assets/restaurant/r{index+1}_icon.png", (64, 64))
         
         # Progress bar
         self.progress_rect = pygame.Rect(self.pos[0], self.pos[1] - 24, 90, 18)
         
     def draw(self, screen, level):
         # Draw button background
-        pygame.draw.rect(screen, BEIGE, self.rect)
-        pygame.draw.rect(screen, GOLD, self.rect, 2)
+        draw_rect(screen, BEIGE, self.rect)
+        draw_rect(screen, GOLD, self.rect, 2)
         
         # Draw icon
         icon_rect = self.icon.get_rect(center=self.rect.center)
         screen.blit(self.icon, icon_rect)
         
         # Draw progress bar
-        pygame.draw.rect(screen, GOLD, self.progress_rect, 2)
+        draw_rect(screen, GOLD, self.progress_rect, 2)
         
         # Draw progress cells
         cell_width = 18
@@ -446,26 +444,31 @@ class UpgradeButton:
                                    cell_width,
                                    self.progress_rect.height)
             if i < level:
-                pygame.draw.rect(screen, GREEN, cell_rect)
+                draw_rect(screen, GREEN, cell_rect)
             else:
-                pygame.draw.rect(screen, RED, cell_rect)
-            pygame.draw.rect(screen, GOLD, cell_rect, 1)
+                draw_rect(screen, RED, cell_rect)
+            draw_rect(screen, GOLD, cell_rect, 1)
             
     def handle_click(self, pos):
         return self.rect.collidepoint(pos)
 
 class Game:
     def __init__(self):
-        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-        pygame.display.set_caption("Restaurant1")
-        self.clock = pygame.time.Clock()
+        self.screen = scene_manager.get_display((WINDOW_WIDTH, WINDOW_HEIGHT), "Restaurant1")
+        # Only the parts of the screen that changed are redrawn
+        self.renderer = DirtyRenderer()
+        # update() runs once per simulation step, not once per frame
+        self.fixed_timestep = True
         self.running = True
         self.font = get_chinese_font(20)
         self.level_font = get_chinese_font(30)
         self.ui_font = get_chinese_font(30)
+        self.level_label = HudLabel(self.level_font, "Level = {}", RED)
+        # MP/Coins panel, re-rendered only when a number changes
+        self.resource_hud = ResourceHUD(self.ui_font, (WINDOW_WIDTH - 210, 10), coins_color=GOLD)
         
-        # Load game data
-        game_manager.load_game_data()
+        # Pick up changes other scenes made to the save
+        game_manager.refresh()
         
         # Level system - load from save (completion count, not building level)
         self.R1 = game_manager.get_building_data('restaurant1').get('completion_count', 0)
@@ -489,23 +492,33 @@ class Game:
                 building.showing_final = True
             self.buildings.append(building)
             
+        # Off-screen objects are skipped; a building covers the area of its biggest image
+        self.viewport = Viewport(self.map, (WINDOW_WIDTH, WINDOW_HEIGHT))
+        self.building_grid = SpatialGrid()
+        for building in self.buildings:
+            self.building_grid.insert(building, centered_bounds(building.center, (
+                *building.construction_imgs, building.construction_static,
+                *building.fireworks, building.final_img)))
+            
         # Create upgrade buttons
         self.upgrade_buttons = []
         for i in range(5):
             self.upgrade_buttons.append(UpgradeButton(i))
             
         # Back button
-        self.back_button = pygame.image.load("./assets/back.png")
-        self.back_button = pygame.transform.scale(self.back_button, (30, 30))
+        self.back_button = load_scaled("./assets/back.png", (30, 30))
         self.back_rect = self.back_button.get_rect(topleft=(550, 50))
         
-        # Characters
+        # Characters (sprites preloaded so spawning never touches disk)
+        preload_characters(0.4)
         self.characters = []
-        self.last_spawn = time.time()
+        # With NumPy, everyone walks in one batched step per simulation step
+        self.crowd = Crowd(LOCATIONS) if Crowd.available else None
+        self.last_spawn = sim_clock.now()
         self.spawn_interval = 1.0  # 1 second
         
     def spawn_character(self):
-        current_time = time.time()
+        current_time = sim_clock.now()
         # Apply spawn speed multiplier from island level
         spawn_multiplier = game_manager.get_spawn_speed_multiplier()
         adjusted_interval = self.spawn_interval / spawn_multiplier
@@ -514,9 +527,9 @@ class Game:
             char_type = random.randint(1, 9)
             spawn_location = random.choice(list(LOCATIONS.keys()))
             spawn_pos = LOCATIONS[spawn_location]
-            character = Character(char_type, spawn_pos)
+            character = Character(char_type, spawn_pos, self.crowd)
             # Apply movement speed multiplier
-            character.speed *= game_manager.get_movement_speed_multiplier()
+            character.set_speed(character.speed * game_manager.get_movement_speed_multiplier())
             self.characters.append(character)
             self.last_spawn = current_time
             
@@ -550,16 +563,16 @@ class Game:
                         self.showing_congratulations = False
                         self.R1 += 1
                         # Update in save file (save to completion_count, not building_level)
-                        game_manager.game_data['buildings']['restaurant1']['completion_count'] = self.R1
+                        game_manager.set_completion_count('restaurant1', self.R1)
                         game_manager._update_island_level()
-                        game_manager.save_game_data()
                         self.reset_building_levels()
+                        game_manager.save_game_data()
+                        game_manager.flush()
                     return
                 
                 # Check back button
                 if self.back_rect.collidepoint(event.pos):
-                    subprocess.Popen(["python3", "main_game.py"])
-                    self.running = False
+                    scene_manager.back()
                     return
                         
                 # Check upgrade buttons
@@ -583,6 +596,9 @@ class Game:
         # Update passive income every minute
         game_manager.update_passive_income()
         
+        # Write coalesced save changes at most every save_interval seconds
+        game_manager.flush_if_due()
+        
         self.spawn_character()
         self.map.update()
         
@@ -591,93 +607,91 @@ class Game:
             building.update()
             
         # Update characters
-        self.characters = [char for char in self.characters if char.update(self.buildings)]
+        if self.crowd is not None:
+            self._update_crowd()
+        else:
+            self.characters = [char for char in self.characters if char.update(self.buildings)]
+        
+    def _update_crowd(self):
+        """Move everyone at once; only characters that arrived somewhere or whose timer is due run update()"""
+        gone = [char for char in self.crowd.step(sim_clock.now()) if not char.update(self.buildings)]
+        if gone:
+            for char in gone:
+                self.crowd.remove(char.slot)
+            self.characters = [char for char in self.characters if char not in gone]
+        
+    def is_idle(self):
+        """Nothing on screen moves: no one walking, no camera or building animation"""
+        return (not self.map.animating and not self.map.dragging
+                and not any(building.animating for building in self.buildings)
+                and not any(char.visible for char in self.characters))
         
     def draw(self):
-        self.screen.fill(WHITE)
+        screen = self.renderer.begin(self.screen)
+        screen.fill(WHITE)
         
         # Draw map
-        self.map.draw(self.screen)
+        self.map.draw(screen)
         
         # Draw buildings - first pass: draw final buildings and static construction
-        for building in self.buildings:
+        visible_buildings = self.building_grid.query(self.viewport.world_rect())
+        for building in visible_buildings:
             if building.showing_final or building.level == 5 or self.R1 > 0 or (building.level > 0 and building.level < 5 and not building.animating):
-                building.draw(self.screen, self.map, self.R1)
+                building.draw(screen, self.map, self.R1)
         
         # Draw characters
-        for character in self.characters:
-            character.draw(self.screen, self.map, self.font)
+        for character in self.viewport.visible_characters(self.characters, self.crowd):
+            character.draw(screen, self.map, self.font)
             
         # Draw buildings - second pass: draw animations on top
-        for building in self.buildings:
+        for building in visible_buildings:
             if building.animating:
-                building.draw(self.screen, self.map, self.R1)
+                building.draw(screen, self.map, self.R1)
             
         # Draw UI
         # Draw level indicator in top-left
-        level_text = self.level_font.render(f"Level = {self.R1}", True, RED)
-        self.screen.blit(level_text, (10, 10))
+        self.level_label.draw(screen, (10, 10), self.R1)
         
         # Draw MP and Coins display
-        self._draw_resources()
+        self._draw_resources(screen)
         
         # Back button
-        self.screen.blit(self.back_button, self.back_rect)
+        screen.blit(self.back_button, self.back_rect)
         
         # Upgrade buttons
         for i, btn in enumerate(self.upgrade_buttons):
-            btn.draw(self.screen, self.buildings[i].level)
+            btn.draw(screen, self.buildings[i].level)
             
         # Draw congratulations popup if needed
         if self.showing_congratulations:
             # Draw popup background
-            pygame.draw.rect(self.screen, WHITE, self.congrats_rect)
-            pygame.draw.rect(self.screen, BLACK, self.congrats_rect, 3)
+            draw_rect(screen, WHITE, self.congrats_rect)
+            draw_rect(screen, BLACK, self.congrats_rect, 3)
             
             # Draw congratulations text
-            congrats_text = self.font.render("Congratulations,", True, BLACK)
+            congrats_text = render_text(self.font, "Congratulations,", BLACK)
             text_rect = congrats_text.get_rect(center=(self.congrats_rect.centerx, self.congrats_rect.y + 50))
-            self.screen.blit(congrats_text, text_rect)
+            screen.blit(congrats_text, text_rect)
             
-            upgrade_text = self.font.render("You've Upgraded!", True, BLACK)
+            upgrade_text = render_text(self.font, "You've Upgraded!", BLACK)
             text_rect = upgrade_text.get_rect(center=(self.congrats_rect.centerx, self.congrats_rect.y + 80))
-            self.screen.blit(upgrade_text, text_rect)
+            screen.blit(upgrade_text, text_rect)
             
             # Draw OK button
-            pygame.draw.rect(self.screen, GOLD, self.ok_button_rect)
-            pygame.draw.rect(self.screen, BLACK, self.ok_button_rect, 2)
-            ok_text = self.font.render("OK", True, BLACK)
+            draw_rect(screen, GOLD, self.ok_button_rect)
+            draw_rect(screen, BLACK, self.ok_button_rect, 2)
+            ok_text = render_text(self.font, "OK", BLACK)
             ok_rect = ok_text.get_rect(center=self.ok_button_rect.center)
-            self.screen.blit(ok_text, ok_rect)
+            screen.blit(ok_text, ok_rect)
             
-        pygame.display.flip()
+        self.renderer.present()
         
-    def _draw_resources(self):
+    def _draw_resources(self, screen):
         """Draw MP and Coins at top of screen"""
-        mp, coins = game_manager.get_player_resources()
-        
-        # Draw background for resources
-        resource_bg = pygame.Surface((200, 60))
-        resource_bg.fill((200, 200, 200))
-        resource_bg.set_alpha(200)
-        self.screen.blit(resource_bg, (WINDOW_WIDTH - 210, 10))
-        
-        # Draw MP
-        mp_text = self.ui_font.render(f"MP: {int(mp)}", True, (0, 0, 255))
-        self.screen.blit(mp_text, (WINDOW_WIDTH - 200, 15))
-        
-        # Draw Coins
-        coins_text = self.ui_font.render(f"Coins: {int(coins)}", True, GOLD)
-        self.screen.blit(coins_text, (WINDOW_WIDTH - 200, 40))
+        self.resource_hud.draw(screen)
         
     def run(self):
-        while self.running:
-            self.handle_events()
-            self.update()
-            self.draw()
-            self.clock.tick(FPS)
-            
-        pygame.quit()
+        scene_manager.run(self)
 
 if __name__ == "__main__":
     game = Game()
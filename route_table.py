@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+from collections import deque
+
+class RouteTable:
+    """
+    Every shortest route of a scene's walkway graph, compiled once at import.
+    route() is a dict lookup that returns a shared tuple, so characters walk
+    it by index and must never modify it. Routes are the ones a breadth-first
+    search over CONNECTIONS (in its neighbour order) would find.
+    """
+
+    def __init__(self, locations, connections):
+        self.locations = locations
+        self.routes = {}
+        for start in locations:
+            self._add_routes_from(start, connections)
+        # Characters re-route from the waypoint they are standing on
+        self.location_at = {}
+        for name, pos in locations.items():
+            self.location_at.setdefault(tuple(pos), name)
+
+    def _add_routes_from(self, start, connections):
+        # One BFS per start gives the same parent tree as a BFS per pair
+        parents = {start: None}
+        queue = deque([start])
+        while queue:
+            current = queue.popleft()
+            for neighbor in connections.get(current, []):
+                if neighbor not in parents:
+                    parents[neighbor] = current
+                    queue.append(neighbor)
+
+        for end in parents:
+            route = []
+            node = end
+            while node is not None:
+                route.append(node)
+                node = parents[node]
+            route.reverse()
+            self.routes[(start, end)] = tuple(route)
+        self.routes[(start, start)] = (start,)
+
+    def route(self, start, end):
+        """Locations from start to end (both included), () if unreachable"""
+        return self.routes.get((start, end), ())
+
+    def nearest(self, pos):
+        """Name of the location closest to pos"""
+        name = self.location_at.get((pos[0], pos[1]))
+        if name is not None:
+            return name
+        # Off the waypoints (mid-walk): scan, comparing squared distances
+        min_dist = float('inf')
+        for loc, loc_pos in self.locations.items():
+            dist = (pos[0] - loc_pos[0])**2 + (pos[1] - loc_pos[1])**2
+            if dist < min_dist:
+                min_dist = dist
+                name = loc
+        return name
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+import os
+import struct
+import threading
+from typing import List, Tuple
+
+# One record per change: sequence number, wall-clock timestamp, MP delta,
+# coins delta, and what else the change sets as kind, target and value
+# (see GameManager._apply_change). Records are fixed-size so a torn write
+# at the end of the file can be detected and ignored.
+RECORD = struct.Struct("<QdddBHd")
+# First journal format: resource deltas only
+LEGACY_RECORD = struct.Struct("<Qddd")
+
+class ResourceJournal:
+    """Append-only log of player resource deltas that sits next to the save file"""
+
+    def __init__(self, path: str, fsync: bool = False):
+        self.path = path
+        self.fsync = fsync  # fsync every record (survives power loss, not just crashes)
+        self.record_count = 0
+        self.file = None
+        # Appends happen on the game thread, compaction on the save writer thread
+        self.lock = threading.RLock()
+        # How far this process has read, so other processes' appends can be tailed
+        self._read_offset = 0
+        self._file_id = None
+
+    def read_records(self, after_seq: int = 0) -> List[Tuple[int, float, float, float, int, int, float]]:
+        """Read all complete records with a sequence number greater than after_seq"""
+        with self.lock:
+            return self._read_records(after_seq)
+
+    def read_new(self, after_seq: int) -> List[Tuple[int, float, float, float, int, int, float]]:
+        """Read only records appended since the last read (by any process)"""
+        with self.lock:
+            try:
+                st = os.stat(self.path)
+            except FileNotFoundError:
+                self.record_count = 0
+                self._read_offset = 0
+                self._file_id = None
+                return []
+            if (st.st_dev, st.st_ino) != self._file_id or st.st_size < self._read_offset:
+                # Compacted or replaced by someone else: start over
+                return self._read_records(after_seq)
+            if st.st_size - self._read_offset < RECORD.size:
+                return []
+            with open(self.path, 'rb') as f:
+                f.seek(self._read_offset)
+                data = f.read()
+            usable = len(data) - len(data) % RECORD.size
+            self._read_offset += usable
+            self.record_count = self._read_offset // RECORD.size
+            return self._unpack(data, usable, after_seq)
+
+    def _read_records(self, after_seq):
+        if not os.path.exists(self.path):
+            self.record_count = 0
+            self._read_offset = 0
+            self._file_id = None
+            return []
+        with open(self.path, 'rb') as f:
+            st = os.fstat(f.fileno())
+            data = f.read()
+        # Ignore a partially written trailing record
+        usable = len(data) - len(data) % RECORD.size
+        self.record_count = usable // RECORD.size
+        self._read_offset = usable
+        self._file_id = (st.st_dev, st.st_ino)
+        records = self._unpack(data, usable, after_seq)
+        if usable != len(data):
+            self._drop_torn_tail(usable)
+        return records
+
+    def _unpack(self, data, usable, after_seq):
+        records = []
+        for offset in range(0, usable, RECORD.size):
+            record = RECORD.unpack_from(data, offset)
+            if record[0] > after_seq:
+                records.append(record)
+        return records
+
+    def append(self, seq: int, timestamp: float, mp_delta: float, coins_delta: float,
+               kind: int = 0, target: int = 0, value: float = 0.0):
+        """Append one record and hand it to the OS immediately"""
+        self.append_many([(seq, timestamp, mp_delta, coins_delta, kind, target, value)])
+
+    def append_many(self, records):
+        """Append several records with a single write"""
+        if not records:
+            return
+        with self.lock:
+            self._reopen_if_replaced()
+            if self.file is None:
+                self.file = open(self.path, 'ab', buffering=0)
+            st = os.fstat(self.file.fileno())
+            data = b"".join(RECORD.pack(*record) for record in records)
+            self.file.write(data)
+            if self.fsync:
+                os.fsync(self.file.fileno())
+            self.record_count += len(records)
+            # Skip our own records when tailing, if we had read everything before them
+            if (st.st_dev, st.st_ino) == self._file_id and st.st_size == self._read_offset:
+                self._read_offset += len(data)
+
+    def discard_through(self, seq: int):
+        """Drop records up to seq (called once a snapshot containing them is on disk)"""
+        with self.lock:
+            remaining = self._read_records(seq)
+            self.close()
+            temp_path = self.path + ".tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(b"".join(RECORD.pack(*record) for record in remaining))
+            os.replace(temp_path, self.path)
+            st = os.stat(self.path)
+            self.record_count = len(remaining)
+            # Other processes' records may have been kept unread: tail from the start
+            self._read_offset = 0
+            self._file_id = (st.st_dev, st.st_ino)
+
+    def import_legacy(self, legacy_path: str):
+        """Carry the records of a first-format journal over as plain resource deltas, then delete it"""
+        with self.lock:
+            if not os.path.exists(legacy_path):
+                return
+            with open(legacy_path, 'rb') as f:
+                data = f.read()
+            usable = len(data) - len(data) % LEGACY_RECORD.size
+            self.append_many([LEGACY_RECORD.unpack_from(data, offset) + (0, 0, 0.0)
+                              for offset in range(0, usable, LEGACY_RECORD.size)])
+            os.remove(legacy_path)
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+    def _reopen_if_replaced(self):
+        # Another process may have compacted the journal into a new file
+        if self.file is None:
+            return
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            self.close()
+            return
+        current = os.fstat(self.file.fileno())
+        if (st.st_dev, st.st_ino) != (current.st_dev, current.st_ino):
+            self.close()
+
+    def _drop_torn_tail(self, size: int):
+        # Caller holds the lock
+        self.close()
+        with open(self.path, 'r+b') as f:
+            f.truncate(size)
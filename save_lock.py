@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+import os
+import struct
+import threading
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+try:
+    import msvcrt
+except ImportError:
+    msvcrt = None
+
+COUNTER = struct.Struct("<Q")
+
+class SaveLock:
+    """
+    Exclusive lock shared by every process (and thread) that touches the save.
+    Scenes launched as separate processes take it around every read-modify-write
+    of game_save.json and its journal. Re-entrant within a process.
+    The lock file also holds a counter that is bumped on every snapshot write,
+    so other processes can tell the save changed without stat() heuristics.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._fd = None
+
+    def acquire(self):
+        self._thread_lock.acquire()
+        self._depth += 1
+        if self._depth == 1:
+            try:
+                self._lock_file()
+            except Exception:
+                self._depth -= 1
+                self._thread_lock.release()
+                raise
+
+    def release(self):
+        self._depth -= 1
+        if self._depth == 0:
+            self._unlock_file()
+        self._thread_lock.release()
+
+    def read_counter(self) -> int:
+        """Read the revision counter stored in the lock file (lock must be held)"""
+        os.lseek(self._fd, 0, os.SEEK_SET)
+        data = os.read(self._fd, COUNTER.size)
+        if len(data) < COUNTER.size:
+            return 0
+        return COUNTER.unpack(data)[0]
+
+    def write_counter(self, value: int):
+        """Publish a new revision counter to every process (lock must be held)"""
+        os.lseek(self._fd, 0, os.SEEK_SET)
+        os.write(self._fd, COUNTER.pack(value))
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.release()
+
+    def _lock_file(self):
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_EX)
+        elif msvcrt is not None:
+            msvcrt.locking(self._fd, msvcrt.LK_LOCK, 1)
+        # Platforms with neither only get the in-process lock
+
+    def _unlock_file(self):
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._fd, fcntl.LOCK_UN)
+            elif msvcrt is not None:
+                os.lseek(self._fd, 0, os.SEEK_SET)
+                msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+        finally:
+            os.close(self._fd)
+            self._fd = None
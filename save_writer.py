@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+import os
+import threading
+
+class SaveWriter:
+    """
+    Writes save snapshots on a dedicated background thread.
+    Only the latest submitted snapshot is kept (older pending ones are dropped),
+    and every write goes to a temp file that is atomically renamed over the
+    save, so a crash can never leave a half-written save behind.
+    """
+
+    def __init__(self, path, fsync=True, on_written=None, on_error=None, lock=None, before_write=None):
+        self.path = path
+        self.backup_path = path + ".bak"
+        self.fsync = fsync  # fsync file and directory before the rename is considered done
+        self.on_written = on_written  # called with the snapshot token after a successful write
+        self.on_error = on_error  # called with the exception when a write fails
+        self.lock = lock  # held around the rename so other processes never see a stale base
+        self.before_write = before_write  # returns False to drop a snapshot that lost a race
+        self._condition = threading.Condition()
+        self._pending = None
+        self._busy = False
+        self._closed = False
+        self._thread = None
+
+    def submit(self, text, token=None):
+        """Queue a serialized snapshot, replacing any snapshot still waiting"""
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("SaveWriter is closed")
+            self._pending = (text, token)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="save-writer", daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def wait(self, timeout=None):
+        """Block until every submitted snapshot has been written"""
+        with self._condition:
+            return self._condition.wait_for(lambda: self._pending is None and not self._busy, timeout)
+
+    def close(self):
+        """Write whatever is pending and stop the writer thread"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._pending is not None or self._closed)
+                if self._pending is None:
+                    return
+                text, token = self._pending
+                self._pending = None
+                self._busy = True
+            try:
+                if self.lock is not None:
+                    with self.lock:
+                        self._write_checked(text, token)
+                else:
+                    self._write_checked(text, token)
+            except Exception as e:
+                print(f"Error saving game: {e}")
+                if self.on_error:
+                    self.on_error(e)
+            finally:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+
+    def _write_checked(self, text, token):
+        if self.before_write and not self.before_write(token):
+            return
+        self._write(text)
+        if self.on_written:
+            self.on_written(token)
+
+    def _write(self, text):
+        temp_path = self.path + ".tmp"
+        with open(temp_path, 'w') as f:
+            f.write(text)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        self._keep_backup()
+        os.replace(temp_path, self.path)
+        if self.fsync:
+            self._fsync_directory()
+
+    def _keep_backup(self):
+        # Hard-link the current save as the backup; the save path never disappears
+        if not os.path.exists(self.path):
+            return
+        try:
+            link_path = self.backup_path + ".tmp"
+            if os.path.exists(link_path):
+                os.remove(link_path)
+            os.link(self.path, link_path)
+            os.replace(link_path, self.backup_path)
+        except OSError:
+            # Filesystems without hard links simply don't get a backup
+            pass
+
+    def _fsync_directory(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            fd = os.open(directory, os.O_RDONLY)
+        except OSError:
+            return  # Not supported on this platform (e.g. Windows)
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
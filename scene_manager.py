@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+import importlib
+import os
+import sys
+import pygame
+from game_manager import game_manager
+from asset_cache import convert_loaded, report_unconverted
+import dirty_rect
+from sim_clock import sim_clock
+from frame_pacer import FramePacer
+
+FPS = 60
+
+def _scene_module_name(script):
+    """Module name of a scene script, e.g. "./temple1.py" -> temple1"""
+    return os.path.splitext(os.path.basename(script))[0]
+
+class SceneManager:
+    """
+    Runs every scene in one process on a stack. Opening a building or mini-game
+    pushes its Game on top of the current one and the back button pops it, so
+    the scene underneath resumes exactly where it was. The display, the
+    GameManager and the asset caches are shared by all scenes.
+
+    A scene is any object with handle_events(), update(), draw() and a
+    running flag (cleared when the window is closed). Optional hooks:
+    on_resume() when it is on top again, on_exit() when it leaves the stack.
+    A scene with fixed_timestep set has update() run once per sim_clock step,
+    as many times per frame as are due; others update once per frame.
+    is_idle() returning True lets the loop drop to a low frame rate until
+    the next input (see FramePacer).
+    """
+
+    def __init__(self):
+        self.stack = []  # [(scene, window_size, caption)]
+        self.clock = pygame.time.Clock()
+        self.pacer = FramePacer(self.clock)
+        self.running = False
+        # Transitions requested while a scene handles events run between frames
+        self.pending = []
+
+    def get_display(self, size, caption=None):
+        """Shared display surface; the window is only recreated if the size changes"""
+        screen = pygame.display.get_surface()
+        if screen is None or screen.get_size() != tuple(size):
+            screen = pygame.display.set_mode(size)
+            # Images loaded before there was a display get its pixel format now
+            convert_loaded()
+            dirty_rect.invalidate()
+        if caption is not None:
+            pygame.display.set_caption(caption)
+        return screen
+
+    @property
+    def current(self):
+        return self.stack[-1][0] if self.stack else None
+
+    def push(self, scene):
+        """Open a scene on top of the current one (Game instance, class or script name)"""
+        self.pending.append(("push", scene))
+
+    def pop(self):
+        """Close the current scene and resume the one underneath"""
+        self.pending.append(("pop", None))
+
+    def replace(self, scene):
+        """Close the current scene and open another in its place"""
+        self.pending.append(("replace", scene))
+
+    def back(self, default="main_game.py"):
+        """Return to the previous scene, or to default if this is the bottom one"""
+        if len(self.stack) > 1:
+            self.pop()
+        else:
+            self.replace(default)
+
+    def load_scene(self, scene):
+        """Create a scene from a Game instance, a Game class, or a script name like "temple1.py" """
+        if isinstance(scene, str):
+            scene = self._import_scene_module(_scene_module_name(scene)).Game
+        if isinstance(scene, type):
+            scene = scene()
+        return scene
+
+    def _import_scene_module(self, module_name):
+        # The script started from the command line is __main__, not its own name;
+        # importing it again would give a second copy of its module state
+        main = sys.modules.get("__main__")
+        main_file = getattr(main, "__file__", None)
+        if main_file and _scene_module_name(main_file) == module_name:
+            return main
+        return importlib.import_module(module_name)
+
+    def run(self, scene):
+        """Run the scene loop until the window is closed or the stack is empty"""
+        self._push(self.load_scene(scene))
+        self.running = True
+        while self.running and self.stack:
+            scene = self.current
+            self.pacer.begin_frame()
+            scene.handle_events()
+            if not scene.running:
+                # Window closed: quit the whole game, not just this scene
+                break
+            if self.pending:
+                self._apply_pending()
+                # The next scene's first frame is drawn in full
+                dirty_rect.invalidate()
+                continue
+            steps = sim_clock.advance()
+            # A frame's rewards, income and MP use are journaled together
+            with game_manager.transaction():
+                if getattr(scene, "fixed_timestep", False):
+                    for _ in range(steps):
+                        sim_clock.step()
+                        scene.update()
+                else:
+                    sim_clock.step(steps)
+                    scene.update()
+            scene.draw()
+            self.pacer.end_frame(scene, getattr(scene, "fps", FPS))
+        self._shutdown()
+
+    def _apply_pending(self):
+        pending, self.pending = self.pending, []
+        for action, scene in pending:
+            try:
+                if action == "push":
+                    self._push(self.load_scene(scene))
+                elif action == "pop":
+                    self._pop()
+                elif action == "replace":
+                    new_scene = self.load_scene(scene)
+                    self._pop(resume=False)
+                    self._push(new_scene)
+            except (ImportError, AttributeError, OSError, pygame.error) as e:
+                # e.g. a building whose scene or assets don't exist yet
+                print(f"Error opening scene {scene}: {e}")
+        # Entering or leaving a scene writes the save, as when scenes were
+        # separate processes; the writer thread does the disk work
+        game_manager.flush()
+        if not self.stack:
+            self.running = False
+
+    def _push(self, scene):
+        # The scene set up the display in its constructor; remember it for resuming
+        screen = pygame.display.get_surface()
+        size = screen.get_size() if screen else None
+        caption = pygame.display.get_caption()
+        self.stack.append((scene, size, caption[0] if caption else None))
+        # Anything the scene loaded that still needs converting on every blit
+        report_unconverted()
+
+    def _pop(self, resume=True):
+        scene, size, caption = self.stack.pop()
+        self._exit_scene(scene)
+        if resume and self.stack:
+            scene, size, caption = self.stack[-1]
+            screen = self.get_display(size, caption) if size else None
+            if screen is not None and hasattr(scene, "screen"):
+                scene.screen = screen
+            if hasattr(scene, "on_resume"):
+                scene.on_resume()
+
+    def _exit_scene(self, scene):
+        if hasattr(scene, "on_exit"):
+            scene.on_exit()
+
+    def _shutdown(self):
+        while self.stack:
+            scene, size, caption = self.stack.pop()
+            self._exit_scene(scene)
+        self.running = False
+        game_manager.flush()
+        pygame.quit()
+
+
+# Global instance
+scene_manager = SceneManager()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+import time
+
+TICK_RATE = 60  # Simulation steps per second; character speeds are pixels per step
+TICK = 1.0 / TICK_RATE
+MAX_FRAME_TIME = 0.25  # Longer stalls (loading, dragging the window) are not caught up
+INTERPOLATE = True  # Draw crowds between the last two steps instead of at the latest
+
+class SimClock:
+    """
+    Fixed-timestep game time shared by every scene. Each frame the scene
+    manager feeds the real time that passed into advance() (times speed,
+    for fast-forward) and runs one update() per whole TICK that is due, so
+    walking speed, animations and timers come out the same at any frame
+    rate. now() is the time of the step being simulated and replaces
+    time.time() in scene updates; it starts at the wall clock, so
+    timestamps look like time.time()'s.
+
+    The real time left over, less than a step, gives alpha: drawing that
+    far from the previous step towards the latest hides the uneven number
+    of steps per frame.
+    """
+
+    def __init__(self, tick=TICK, speed=1.0):
+        self.tick = tick
+        self.speed = speed
+        self.time = time.time()
+        self.steps = 0
+        self.accumulator = 0.0
+        self.last_real = None
+
+    def now(self):
+        return self.time
+
+    def advance(self):
+        """Account for the real time since the last call; returns the number of steps due"""
+        real = time.perf_counter()
+        if self.last_real is None:
+            self.last_real = real
+        elapsed = min(real - self.last_real, MAX_FRAME_TIME)
+        self.last_real = real
+        self.accumulator += elapsed * self.speed
+        return int(self.accumulator / self.tick)
+
+    def step(self, count=1):
+        """Move simulation time forward by count steps"""
+        self.accumulator = max(0.0, self.accumulator - count * self.tick)
+        self.time += count * self.tick
+        self.steps += count
+
+    @property
+    def alpha(self):
+        """Where to draw between the previous step (0) and the latest one (1)"""
+        if not INTERPOLATE:
+            return 1.0
+        return min(self.accumulator / self.tick, 1.0)
+
+
+# Global instance
+sim_clock = SimClock()
@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+import json
+import os
+import time
+import pytest
+
+REPO = os.path.dirname(os.path.abspath(__file__))
+
+@pytest.fixture
+def save_dir(tmp_path, monkeypatch):
+    """A copy of the shipped save in a scratch directory, one hour since the last income"""
+    with open(os.path.join(REPO, "game_save.json"), 'r') as f:
+        data = json.load(f)
+    data['buildings']['temple1']['last_income_collected'] = time.time() - 3600
+    with open(tmp_path / "game_save.json", 'w') as f:
+        json.dump(data, f)
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+def new_manager():
+    from game_manager import GameManager
+    return GameManager()
+
+def test_income_is_paid_once_across_restart(save_dir):
+    manager = new_manager()
+    first = manager.collect_income('temple1')
+    # Journaled with its collection time: no snapshot needed
+    assert not manager.dirty
+    manager.close()
+
+    manager = new_manager()
+    second = manager.collect_income('temple1')
+    manager.close()
+
+    assert first > 0
+    assert second < first / 1000
+
+def test_upgrade_survives_crash(save_dir):
+    manager = new_manager()
+    coins = manager.get_player_resources()[1]
+    cost = manager.calculate_upgrade_cost('temple1', 't1_1', 1)
+    assert manager.upgrade_structure('temple1', 't1_1')
+    # No close(): the process dies right after the upgrade
+
+    manager = new_manager()
+    assert manager.get_structure_level('temple1', 't1_1') == 1
+    assert manager.get_player_resources()[1] == pytest.approx(coins - cost)
+    manager.close()
+
+def test_legacy_journal_is_replayed(save_dir):
+    import struct
+    with open("game_save.json", 'r') as f:
+        data = json.load(f)
+    with open("game_save.journal", 'wb') as f:
+        f.write(struct.pack("<Qddd", data.get('journal_seq', 0) + 1, time.time(), 0, 100.0))
+
+    manager = new_manager()
+    assert manager.get_player_resources()[1] == pytest.approx(data['player']['coins'] + 100)
+    assert not os.path.exists("game_save.journal")
+    manager.close()
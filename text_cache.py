@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+from collections import OrderedDict
+
+class TextCache:
+    """
+    Rendered text surfaces keyed by (font, text, color, antialias), least
+    recently used dropped first. Fonts come from font_helper, which shares
+    one object per size and style, so the font itself is a stable key.
+    Returned surfaces are shared: blit them, never draw on them.
+    """
+
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, font, text, color, antialias=True):
+        key = (font, text, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = font.render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+
+# Global instance
+text_cache = TextCache()
+
+def render_text(font, text, color, antialias=True):
+    """font.render(text, antialias, color), cached"""
+    return text_cache.render(font, text, color, antialias)
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+import re
+from collections import OrderedDict
+import pygame
+
+# Ideographs, kana, hangul and full-width forms can break between any two characters
+CJK = "⺀-鿿가-힯豈-﫿＀-￯"
+# ...except before closing punctuation, which stays with the character before it
+CLOSING = "、。，．！？；：）」』》〉】〕…"
+TOKEN = re.compile(rf"([{CJK}][{CLOSING}]*|[^\s{CJK}]+)(\s*)")
+IS_CJK = re.compile(rf"[{CJK}]")
+
+_lines = {}  # (text, font, width) -> lines
+_panels = OrderedDict()  # (text, font, width, color, line_height) -> surface
+MAX_PANELS = 64
+
+def _tokens(text):
+    """Break opportunities, each with the space that follows it in the text"""
+    for match in TOKEN.finditer(text):
+        token, space = match.groups()
+        # A Latin word ending the text is measured with its space, as it always was
+        if space or not IS_CJK.match(token) and match.end() == len(text):
+            token += " "
+        yield token
+
+def wrap_text(text, font, width):
+    """
+    Lines of text that each render narrower than width. Words longer than
+    a line get a line of their own. Computed once per (text, font, width).
+    """
+    key = (text, font, width)
+    lines = _lines.get(key)
+    if lines is not None:
+        return lines
+
+    lines = []
+    current_line = ""
+    for token in _tokens(text):
+        test_line = current_line + token
+        if font.size(test_line)[0] < width:
+            current_line = test_line
+        else:
+            if current_line:
+                lines.append(current_line.strip())
+            current_line = token
+    if current_line:
+        lines.append(current_line.strip())
+    lines = tuple(lines)
+    _lines[key] = lines
+    return lines
+
+def render_wrapped(text, font, width, color, line_height):
+    """
+    The wrapped text pre-composited on one transparent surface, so a text
+    block is a single blit. Surfaces are shared: blit them, never draw on them.
+    """
+    key = (text, font, width, tuple(color), line_height)
+    panel = _panels.get(key)
+    if panel is not None:
+        _panels.move_to_end(key)
+        return panel
+
+    lines = [font.render(line, True, color) for line in wrap_text(text, font, width)]
+    panel_width = max((line.get_width() for line in lines), default=0)
+    panel_height = (len(lines) - 1) * line_height + lines[-1].get_height() if lines else 0
+    panel = pygame.Surface((max(1, panel_width), max(1, panel_height)), pygame.SRCALPHA)
+    y = 0
+    for line in lines:
+        # MAX onto a fully transparent surface copies the glyph pixels exactly,
+        # so the panel blends onto the screen like the separate lines would
+        panel.blit(line, (0, y), special_flags=pygame.BLEND_RGBA_MAX)
+        y += line_height
+    _panels[key] = panel
+    if len(_panels) > MAX_PANELS:
+        _panels.popitem(last=False)
+    return panel
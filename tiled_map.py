@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+import json
+import os
+import pygame
+from asset_cache import BAKED_DIR, load_image, to_display_format, uses_alpha
+
+TILE_SIZE = 256
+RESIDENT_MARGIN = TILE_SIZE  # Tiles this close to the screen stay loaded
+MAP_IMAGES = [
+    "./assets/mainmap/mainmap.png",
+    "./assets/temple1/t1map.png",
+    "./assets/temple2/t2map.png",
+    "./assets/hotel/h1map.png",
+    "./assets/apt/a1map.png",
+    "./assets/restaurant/r1map.png",
+]
+
+def tile_dir(path):
+    """Where bake_assets.py cuts a map, e.g. assets/apt/a1map.png -> assets/baked/tiles/apt/a1map"""
+    name = os.path.splitext(os.path.relpath(os.path.normpath(path), "assets"))[0]
+    return os.path.normpath(os.path.join(BAKED_DIR, "tiles", name))
+
+def _index_path(path):
+    return os.path.join(tile_dir(path), "index.json")
+
+def is_current(path, tile_size=TILE_SIZE):
+    """
+    Whether the map's tiles exist, use tile_size and were cut from the image
+    as it is now. A build that ships only the tiles has no image to compare.
+    """
+    try:
+        with open(_index_path(path), 'r', encoding='utf-8') as f:
+            index = json.load(f)
+        if index.get("tile_size") != tile_size or "source_mtime" not in index:
+            return False
+        return not os.path.exists(path) or os.path.getmtime(path) <= index["source_mtime"]
+    except (OSError, ValueError):
+        return False
+
+def cut(path, tile_size=TILE_SIZE):
+    """Cut a map image into tile_size squares (the last row and column may be smaller)"""
+    source_mtime = os.path.getmtime(path)
+    image = pygame.image.load(path)
+    width, height = image.get_size()
+    directory = tile_dir(path)
+    os.makedirs(directory, exist_ok=True)
+    count = 0
+    for row in range((height + tile_size - 1) // tile_size):
+        for column in range((width + tile_size - 1) // tile_size):
+            rect = pygame.Rect(column * tile_size, row * tile_size, tile_size, tile_size).clip(image.get_rect())
+            tile = image.subsurface(rect)
+            if not uses_alpha(tile):
+                opaque = pygame.Surface(rect.size, 0, 24)
+                opaque.blit(tile, (0, 0))
+                tile = opaque
+            pygame.image.save(tile, os.path.join(directory, f"{column}_{row}.png"))
+            count += 1
+    # Written last: a half-cut map is never mistaken for a current one
+    index_path = _index_path(path)
+    with open(index_path + ".tmp", 'w', encoding='utf-8') as f:
+        json.dump({"width": width, "height": height, "tile_size": tile_size,
+                   "source_mtime": source_mtime}, f)
+    os.replace(index_path + ".tmp", index_path)
+    return count
+
+def cut_all(force=False):
+    """Cut every scene map into tiles"""
+    for path in MAP_IMAGES:
+        if not force and is_current(path):
+            print(f"{path}: tiles up to date")
+            continue
+        count = cut(path)
+        print(f"{path}: {count} tiles -> {tile_dir(path)}")
+
+class TiledMap:
+    """
+    A map background drawn as fixed-size tiles. With tiles cut by
+    bake_assets.py (part of every build) only the tiles on or near the
+    screen are loaded, so the build specs leave the full image out; tiles
+    that scroll further away are dropped again, so memory follows the
+    screen size rather than the map size. Without baked tiles the whole
+    image is loaded and drawn tile by tile from memory.
+    """
+
+    def __init__(self, path, tile_size=TILE_SIZE):
+        self.path = path
+        self.tile_size = tile_size
+        self.tiles = {}  # (column, row) -> Surface
+        self.image = None
+        if is_current(path, tile_size):
+            with open(_index_path(path), 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            self.size = (index["width"], index["height"])
+            self.directory = tile_dir(path)
+        else:
+            self.image = load_image(path)
+            self.size = self.image.get_size()
+        self.columns = (self.size[0] + tile_size - 1) // tile_size
+        self.rows = (self.size[1] + tile_size - 1) // tile_size
+
+    def get_rect(self, **kwargs):
+        """Like Surface.get_rect(), e.g. get_rect(center=...)"""
+        rect = pygame.Rect((0, 0), self.size)
+        for name, value in kwargs.items():
+            setattr(rect, name, value)
+        return rect
+
+    def _tile(self, column, row):
+        tile = self.tiles.get((column, row))
+        if tile is None:
+            size = self.tile_size
+            if self.image is not None:
+                rect = pygame.Rect(column * size, row * size, size, size).clip(self.image.get_rect())
+                tile = self.image.subsurface(rect)
+            else:
+                tile = to_display_format(pygame.image.load(
+                    os.path.join(self.directory, f"{column}_{row}.png")))
+            self.tiles[(column, row)] = tile
+        return tile
+
+    def _tile_range(self, rect):
+        """Columns and rows of the tiles overlapping a map-space rect"""
+        size = self.tile_size
+        columns = range(max(0, rect.left // size), min(self.columns, (rect.right - 1) // size + 1))
+        rows = range(max(0, rect.top // size), min(self.rows, (rect.bottom - 1) // size + 1))
+        return columns, rows
+
+    def draw(self, screen, pos):
+        """Blit the tiles visible on screen with the map's top-left corner at pos"""
+        x, y = int(pos[0]), int(pos[1])
+        view = screen.get_rect().move(-x, -y)
+        columns, rows = self._tile_range(view)
+        size = self.tile_size
+        for row in rows:
+            for column in columns:
+                screen.blit(self._tile(column, row), (x + column * size, y + row * size))
+        if self.image is None:
+            self._evict(view.inflate(2 * RESIDENT_MARGIN, 2 * RESIDENT_MARGIN))
+
+    def _evict(self, resident):
+        columns, rows = self._tile_range(resident)
+        for key in [key for key in self.tiles if key[0] not in columns or key[1] not in rows]:
+            del self.tiles[key]
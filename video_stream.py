@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+import os
+import threading
+from collections import deque
+import pygame
+from frame_store import FrameStore, store_path
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+def open_video(path, size, buffer_frames=6, loop=True):
+    """
+    A VideoStream of the clip, read from its baked FrameStore when there is
+    an up-to-date one of this size (no OpenCV needed), otherwise decoded
+    """
+    stored = store_path(path)
+    if os.path.exists(stored) and not (os.path.exists(path) and os.path.getmtime(path) > os.path.getmtime(stored)):
+        try:
+            store = FrameStore(stored)
+            if store.size == tuple(size):
+                return VideoStream(path, size, buffer_frames, loop, store=store)
+            store.close()
+        except OSError as e:
+            print(f"Error opening frame store: {e}")
+    return VideoStream(path, size, buffer_frames, loop)
+
+class VideoStream:
+    """
+    Decodes a video on a background thread into a small buffer of upcoming
+    frames, already converted to RGB and resized. Frames are tagged with the
+    pass (loop) and frame index they belong to; frame_at() drops the frames
+    playback has skipped and never waits for the decoder, so only a few
+    frames are ever held in memory whatever the playback speed. next_frame()
+    plays the clip frame by frame instead. Decoding starts as soon as the
+    stream is created, so opening the next clip early makes it start instantly.
+    With a FrameStore the thread decodes its JPEG frames instead of the video.
+    """
+
+    def __init__(self, path, size, buffer_frames=6, loop=True, store=None):
+        if store is None and cv2 is None:
+            raise OSError("OpenCV is not available")
+        self.path = path
+        self.size = tuple(size)
+        self.buffer_frames = buffer_frames
+        self.loop = loop
+        self.store = store
+        # Even opening the file takes a while: the decoder thread does it
+        self._opened = threading.Event()
+        self._fps = 0.0
+        self._frame_count = 0
+        self._frames = deque()  # [(pass, index, rgb array or surface)], in decode order
+        self._condition = threading.Condition()
+        self._closed = False
+        self._finished = False
+        self._current = None  # (pass, index, surface) last handed out
+        self._current_array = None  # Pixel data the current surface points into
+        self._thread = threading.Thread(target=self._run, name="video-decoder", daemon=True)
+        self._thread.start()
+
+    @property
+    def fps(self):
+        """Frame rate from the file header (0 if it can't be opened); waits for the open"""
+        self._opened.wait()
+        return self._fps
+
+    @property
+    def frame_count(self):
+        """Frames per pass from the file header (0 if unknown); waits for the open"""
+        self._opened.wait()
+        return self._frame_count
+
+    def _run(self):
+        frames = self._read_store() if self.store is not None else self._read_video()
+        try:
+            while True:
+                with self._condition:
+                    self._condition.wait_for(lambda: len(self._frames) < self.buffer_frames or self._closed)
+                    if self._closed:
+                        break
+                entry = next(frames, None)
+                if entry is None:
+                    break
+                with self._condition:
+                    self._frames.append(entry)
+                    self._condition.notify_all()
+        except Exception as e:
+            print(f"Error decoding video {self.path}: {e}")
+        finally:
+            frames.close()
+            self._opened.set()
+            with self._condition:
+                self._finished = True
+                self._condition.notify_all()
+
+    def _read_video(self):
+        """Decoder thread: (pass, index, rgb array) frames of the video, resized"""
+        cap = cv2.VideoCapture(self.path)
+        loop = 0
+        index = 0
+        try:
+            if not cap.isOpened():
+                print(f"Cannot open video {self.path}")
+                return
+            self._fps = cap.get(cv2.CAP_PROP_FPS)
+            self._frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+            self._opened.set()
+            while True:
+                ret, frame = cap.read()
+                if not ret:
+                    if index == 0 or not self.loop:
+                        return
+                    # Reopening is more reliable than seeking back across codecs
+                    cap.release()
+                    cap = cv2.VideoCapture(self.path)
+                    loop += 1
+                    index = 0
+                    continue
+                frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                frame = cv2.resize(frame, self.size)
+                yield loop, index, frame
+                index += 1
+        finally:
+            cap.release()
+
+    def _read_store(self):
+        """Decoder thread: (pass, index, surface) frames of the FrameStore"""
+        self._fps = self.store.fps
+        self._frame_count = self.store.frame_count
+        self._opened.set()
+        loop = 0
+        while self._frame_count:
+            for index in range(self._frame_count):
+                yield loop, index, self.store.decode(index)
+            if not self.loop:
+                return
+            loop += 1
+
+    def frame_at(self, loop, index, timeout=0.5):
+        """
+        Surface for frame index of pass loop, or the newest earlier frame if
+        the decoder hasn't got there yet. Only the very first call waits
+        (up to timeout) for a frame to be decoded.
+        """
+        entry = None
+        with self._condition:
+            if self._current is None:
+                self._condition.wait_for(lambda: self._frames or self._finished, timeout)
+            while self._frames and self._frames[0][:2] <= (loop, index):
+                entry = self._frames.popleft()
+            if entry is None and self._current is None and self._frames:
+                # Asked for a frame before the first one decoded: show the first
+                entry = self._frames.popleft()
+            if entry is not None:
+                self._condition.notify_all()
+        if entry is not None:
+            self._show(entry)
+        return self._current[2] if self._current else None
+
+    def next_frame(self, timeout=None, first_timeout=0.5):
+        """
+        The next frame in decode order; None only once a non-looping clip has
+        ended. If the decoder is late by more than timeout the previous frame
+        is shown again; only the first frame is waited for (up to
+        first_timeout, then a black frame stands in).
+        """
+        with self._condition:
+            wait = first_timeout if self._current is None else timeout
+            self._condition.wait_for(lambda: self._frames or self._finished, wait)
+            if not self._frames:
+                if self._finished:
+                    return None
+                if self._current is None:
+                    self._current = (0, -1, pygame.Surface(self.size))
+                return self._current[2]
+            entry = self._frames.popleft()
+            self._condition.notify_all()
+        return self._show(entry)
+
+    def _show(self, entry):
+        surface = entry[2]
+        if not isinstance(surface, pygame.Surface):
+            # frombuffer shares the decoded pixels instead of copying them
+            self._current_array = entry[2]
+            surface = pygame.image.frombuffer(entry[2], self.size, "RGB")
+        self._current = (entry[0], entry[1], surface)
+        return surface
+
+    def close(self):
+        """Stop the decoder thread and free the buffered frames"""
+        with self._condition:
+            self._closed = True
+            self._frames.clear()
+            self._condition.notify_all()
+        self._thread.join()
+        if self.store is not None:
+            self.store.close()
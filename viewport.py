@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+import pygame
+
+MARGIN = 80  # Covers a character's sprite plus the icon or text drawn above it
+CELL_SIZE = 256
+
+def centered_bounds(center, images):
+    """World rect covering any of the images drawn centered on center"""
+    rects = [image.get_rect(center=center) for image in images]
+    return rects[0].unionall(rects[1:])
+
+class Viewport:
+    """
+    The part of a Map's world that is on screen, for skipping objects that
+    would be drawn entirely off screen. Follows the map as it scrolls.
+    """
+
+    def __init__(self, map_obj, size):
+        self.map = map_obj
+        self.size = size
+
+    def world_rect(self, margin=0):
+        """Visible world area, grown by margin on every side"""
+        return pygame.Rect(int(-self.map.bg_rect.x) - margin, int(-self.map.bg_rect.y) - margin,
+                           self.size[0] + 2 * margin, self.size[1] + 2 * margin)
+
+    def contains(self, world_pos, margin=MARGIN):
+        left = -self.map.bg_rect.x - margin
+        top = -self.map.bg_rect.y - margin
+        return (left <= world_pos[0] < left + self.size[0] + 2 * margin
+                and top <= world_pos[1] < top + self.size[1] + 2 * margin)
+
+    def visible_characters(self, characters, crowd=None):
+        """
+        The characters near enough to the screen to show, in drawing order.
+        With a crowd the test runs over its position arrays in one go.
+        """
+        if crowd is not None:
+            return crowd.in_rect(self.world_rect(MARGIN))
+        return [character for character in characters if self.contains(character.get_position())]
+
+class SpatialGrid:
+    """
+    Objects with world rects bucketed in square cells, so a query only
+    looks at objects in the cells it overlaps. Query results keep the
+    order objects were inserted in, which is their drawing order.
+    """
+
+    def __init__(self, cell_size=CELL_SIZE):
+        self.cell_size = cell_size
+        self.cells = {}  # (column, row) -> [object]
+        self.entries = {}  # object -> (rect, insertion number)
+        self.inserted = 0
+
+    def _cells(self, rect):
+        size = self.cell_size
+        return [(column, row)
+                for column in range(rect.left // size, (rect.right - 1) // size + 1)
+                for row in range(rect.top // size, (rect.bottom - 1) // size + 1)]
+
+    def insert(self, obj, rect):
+        rect = pygame.Rect(rect)
+        for cell in self._cells(rect):
+            self.cells.setdefault(cell, []).append(obj)
+        self.entries[obj] = (rect, self.inserted)
+        self.inserted += 1
+
+    def query(self, rect):
+        """Objects whose rect overlaps rect, in insertion order"""
+        found = set()
+        for cell in self._cells(pygame.Rect(rect)):
+            found.update(self.cells.get(cell, ()))
+        entries = self.entries
+        found = [obj for obj in found if entries[obj][0].colliderect(rect)]
+        found.sort(key=lambda obj: entries[obj][1])
+        return found
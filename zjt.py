@@ -1,10 +1,14 @@
 #!/usr/bin/env python3
 import pygame
 import time
-import subprocess
 import os
 from game_manager import game_manager
-from font_helper import get_chinese_font, get_default_font
+from scene_manager import scene_manager
+from font_helper import get_chinese_font, get_default_font, preload_fonts
+from asset_cache import load_scaled
+from text_cache import render_text
+from hud import ResourceHUD
+from video_stream import open_video
 try:
     import cv2
 except ImportError:
@@ -43,8 +47,11 @@ SPEED_TIMEOUTS = {
 }
 
 class VideoPlayer:
-    def __init__(self, video_path):
+    def __init__(self, video_path, streaming=True):
         self.video_path = video_path
+        # Streaming decodes a few frames ahead on a thread instead of the whole clip up front
+        self.streaming = streaming
+        self.stream = None
         self.current_speed = 0
         self.is_playing = False
         self.video_length = 7.0  # 7 seconds
@@ -52,6 +59,7 @@ class VideoPlayer:
         self.last_frame_time = time.time()
         self.loops_completed = 0
         self.frames = []
+        self.frame_count = 0
         self.current_frame_index = 0
         
         # Setup video display to fit window first
@@ -67,6 +75,10 @@ class VideoPlayer:
         
     def load_video(self):
         """Load video frames using OpenCV if available"""
+        # Baked frame stores stream without OpenCV or even the clip itself
+        if self.streaming and self.open_stream():
+            return
+            
         if cv2 is None or not os.path.exists(self.video_path):
             # Create placeholder frames if no video or OpenCV
             self.create_placeholder_frames()
@@ -92,6 +104,7 @@ class VideoPlayer:
                 self.frames.append(frame_surface)
                 
             cap.release()
+            self.frame_count = len(self.frames)
             
             if not self.frames:
                 self.create_placeholder_frames()
@@ -100,6 +113,22 @@ class VideoPlayer:
             print(f"Error loading video: {e}")
             self.create_placeholder_frames()
             
+    def open_stream(self):
+        """Start streaming decode; False if the video can't be streamed"""
+        try:
+            stream = open_video(self.video_path, (self.video_width, self.video_height))
+        except OSError as e:
+            print(f"Error opening video stream: {e}")
+            return False
+        if stream.frame_count <= 0:
+            # Unknown length: frame indices can't be mapped to time
+            stream.close()
+            return False
+        self.stream = stream
+        self.frame_count = stream.frame_count
+        self.video_length = stream.frame_count / stream.fps if stream.fps > 0 else 7.0
+        return True
+        
     def create_placeholder_frames(self):
         """Create animated placeholder frames"""
         # Create 60 frames for smooth animation (assuming 60fps)
@@ -125,17 +154,18 @@ class VideoPlayer:
             self.frames.append(frame)
             
         # Set video length for placeholder
+        self.frame_count = len(self.frames)
         self.video_length = 7.0
         
     def update(self, dt):
-        if self.is_playing and self.current_speed > 0 and self.frames:
+        if self.is_playing and self.current_speed > 0 and self.frame_count:
             # Update video time based on speed
             self.current_time += dt * SPEED_RATES[self.current_speed]
             
             # Update frame index based on time
             if self.video_length > 0:
                 frame_progress = (self.current_time / self.video_length) % 1.0
-                self.current_frame_index = int(frame_progress * len(self.frames))
+                self.current_frame_index = int(frame_progress * self.frame_count)
             
             # Check if video completed
             if self.current_time >= self.video_length:
@@ -149,14 +179,27 @@ class VideoPlayer:
         self.current_speed = speed
         self.is_playing = speed > 0
         
+    def get_current_frame(self):
+        if self.stream is not None:
+            return self.stream.frame_at(self.loops_completed, self.current_frame_index)
+        if 0 <= self.current_frame_index < len(self.frames):
+            return self.frames[self.current_frame_index]
+        return None
+        
+    def close(self):
+        if self.stream is not None:
+            self.stream.close()
+            self.stream = None
+        
     def draw(self, screen):
         # Draw current video frame
-        if self.frames and 0 <= self.current_frame_index < len(self.frames):
-            screen.blit(self.frames[self.current_frame_index], self.video_rect)
+        frame = self.get_current_frame()
+        if frame is not None:
+            screen.blit(frame, self.video_rect)
         else:
             # Fallback
             self.video_surface.fill(GRAY)
-            font = pygame.font.Font(None, 36)
+            font = get_default_font(36)
             text = font.render("ZJT Video", True, WHITE)
             text_rect = text.get_rect(center=(self.video_width//2, self.video_height//2))
             self.video_surface.blit(text, text_rect)
@@ -165,7 +208,7 @@ class VideoPlayer:
         # No border needed since video fills entire screen
         
         # Draw current time at bottom of screen (over video)
-        time_font = pygame.font.Font(None, 24)
+        time_font = get_default_font(24)
         time_text = time_font.render(f"{self.current_time:.1f}s / {self.video_length:.1f}s", True, WHITE)
         time_rect = time_text.get_rect(center=(WINDOW_WIDTH//2, WINDOW_HEIGHT - 200))
         # Add background for better visibility
@@ -197,9 +240,8 @@ class MPBar:
             
     def draw(self, screen):
         # Draw MP label
-        font = pygame.font.Font(None, 24)
-        font.set_bold(True)
-        mp_text = font.render("MP", True, WHITE)
+        font = get_default_font(24, bold=True)
+        mp_text = render_text(font, "MP", WHITE)
         screen.blit(mp_text, (self.pos[0] - 40, self.pos[1]))
         
         # Draw MP bar cells
@@ -225,21 +267,22 @@ class SpeedDisplay:
         self.pos = (WINDOW_WIDTH // 2, WINDOW_HEIGHT - 100)
         
     def draw(self, screen, current_speed):
-        font = pygame.font.Font(None, 20)
-        speed_text = font.render(f"Speed: V{current_speed}", True, WHITE)
+        font = get_default_font(20)
+        speed_text = render_text(font, f"Speed: V{current_speed}", WHITE)
         text_rect = speed_text.get_rect(center=self.pos)
         screen.blit(speed_text, text_rect)
 
 class Game:
     def __init__(self):
-        self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
-        pygame.display.set_caption("ZJT - 转经筒修行")
-        self.clock = pygame.time.Clock()
+        self.screen = scene_manager.get_display((WINDOW_WIDTH, WINDOW_HEIGHT), "ZJT - 转经筒修行")
         self.running = True
-        self.ui_font = pygame.font.Font(None, 30)
+        preload_fonts(chinese=(72,), default=(20, 24, 30, 36))
+        self.ui_font = get_default_font(30)
+        # MP/Coins panel, re-rendered only when a number changes
+        self.resource_hud = ResourceHUD(self.ui_font, (WINDOW_WIDTH - 210, 10))
         
-        # Load game data
-        game_manager.load_game_data()
+        # Pick up changes other scenes made to the save
+        game_manager.refresh()
         
         # Game components
         self.video_player = VideoPlayer("./assets/zjt.mp4")
@@ -260,8 +303,7 @@ class Game:
         
         # Load back button
         try:
-            self.back_button = pygame.image.load("./assets/back.png")
-            self.back_button = pygame.transform.scale(self.back_button, (50, 50))
+            self.back_button = load_scaled("./assets/back.png", (50, 50))
         except:
             # Fallback if image doesn't exist
             self.back_button = pygame.Surface((50, 50))
@@ -279,8 +321,7 @@ class Game:
                     # Check back button
                     if self.back_rect.collidepoint(event.pos):
                         # Return to main map
-                        subprocess.Popen(["python3", "main_game.py"])
-                        self.running = False
+                        scene_manager.back()
                         return
                         
                     # Start drag
@@ -362,7 +403,10 @@ class Game:
         # Update passive income every minute
         game_manager.update_passive_income()
         
-        dt = self.clock.get_time() / 1000.0  # Delta time in seconds
+        # Write coalesced save changes at most every save_interval seconds
+        game_manager.flush_if_due()
+        
+        dt = scene_manager.clock.get_time() / 1000.0  # Delta time in seconds
         
         # Update video player
         if self.video_player.update(dt):
@@ -372,6 +416,10 @@ class Game:
         # Update speed reduction
         self.update_speed_reduction()
         
+    def is_idle(self):
+        """Wheel stopped (V0) and not being dragged"""
+        return self.current_speed == 0 and not self.dragging
+        
     def draw(self):
         self.screen.fill(BLACK)
         
@@ -388,12 +436,12 @@ class Game:
         self.screen.blit(self.back_button, self.back_rect)
         
         # Draw instructions (for development)
-        font = pygame.font.Font(None, 20)
-        instruction = font.render("Drag horizontally to increase speed", True, WHITE)
+        font = get_default_font(20)
+        instruction = render_text(font, "Drag horizontally to increase speed", WHITE)
         self.screen.blit(instruction, (10, WINDOW_HEIGHT - 50))
         
         # Draw loops completed
-        loops_text = font.render(f"Loops completed: {self.video_player.loops_completed}", True, WHITE)
+        loops_text = render_text(font, f"Loops completed: {self.video_player.loops_completed}", WHITE)
         self.screen.blit(loops_text, (10, WINDOW_HEIGHT - 30))
         
         # Draw MP and Coins display
@@ -401,32 +449,16 @@ class Game:
         
         pygame.display.flip()
         
+    def on_exit(self):
+        # Stop the decoder thread; the next visit starts a fresh stream
+        self.video_player.close()
+        
     def _draw_resources(self):
         """Draw MP and Coins at top of screen"""
-        mp, coins = game_manager.get_player_resources()
-        
-        # Draw background for resources
-        resource_bg = pygame.Surface((200, 60))
-        resource_bg.fill((200, 200, 200))
-        resource_bg.set_alpha(200)
-        self.screen.blit(resource_bg, (WINDOW_WIDTH - 210, 10))
-        
-        # Draw MP
-        mp_text = self.ui_font.render(f"MP: {int(mp)}", True, (0, 0, 255))
-        self.screen.blit(mp_text, (WINDOW_WIDTH - 200, 15))
-        
-        # Draw Coins
-        coins_text = self.ui_font.render(f"Coins: {int(coins)}", True, (255, 215, 0))
-        self.screen.blit(coins_text, (WINDOW_WIDTH - 200, 40))
+        self.resource_hud.draw(self.screen)
         
     def run(self):
-        while self.running:
-            self.handle_events()
-            self.update()
-            self.draw()
-            self.clock.tick(FPS)
-            
-        pygame.quit()
+        scene_manager.run(self)
 
 if __name__ == "__main__":
     game = Game()